@@ -3,16 +3,45 @@
 CLI script to run model tests defined in YAML configuration files.
 """
 
-import argparse
 import sys
 from pathlib import Path
 
 # Add src to path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from ai_testbed.test_runner import ModelTestRunner
+# Pre-rendered argparse help so `--help` can be answered without building the
+# parser. Keep in sync with build_parser(); tests/test_cli.py checks for drift.
+_STATIC_HELP = """\
+usage: run_tests.py [-h] [--test TEST] [--model MODEL]
+                    [--models-config MODELS_CONFIG]
+                    [--tests-config TESTS_CONFIG]
+                    [--test-run-config TEST_RUN_CONFIG] [--run RUN]
+                    [--runs RUNS] [--all-models] [--bulk-runs BULK_RUNS]
 
-def main():
+Run AI model tests
+
+options:
+  -h, --help            show this help message and exit
+  --test TEST           Run specific test by name (default: run all tests)
+  --model MODEL         Run tests against specific model only
+  --models-config MODELS_CONFIG
+                        Path to models configuration file
+  --tests-config TESTS_CONFIG
+                        Path to tests configuration file
+  --test-run-config TEST_RUN_CONFIG
+                        Path to test run configuration file
+  --run RUN             Path to test run configuration file (alternative to
+                        --test-run-config)
+  --runs RUNS           Number of times to run each test (overrides config
+                        file)
+  --all-models          Run all tests against all configured models
+  --bulk-runs BULK_RUNS
+                        Number of runs for bulk testing (used with --all-
+                        models)"""
+
+def build_parser():
+    """Build the command-line argument parser."""
+    import argparse
     parser = argparse.ArgumentParser(description="Run AI model tests")
     parser.add_argument(
         "--test", 
@@ -56,8 +85,18 @@ def main():
         type=int,
         help="Number of runs for bulk testing (used with --all-models)"
     )
+    return parser
+
+def main():
+    if sys.argv[1:] in (["-h"], ["--help"]):
+        print(_STATIC_HELP)
+        return
+    
+    args = build_parser().parse_args()
     
-    args = parser.parse_args()
+    # Import the runner only after argument parsing so --help and usage errors
+    # don't pay for loading pydantic, requests and every connector
+    from ai_testbed.test_runner import ModelTestRunner
     
     # Handle --run argument (takes precedence over --test-run-config)
     test_run_config_path = args.test_run_config
@@ -91,19 +130,23 @@ def main():
             print(f"Running all {len(runner.tests_config.tests)} tests against all {len(runner.models_config.models)} models with {runs_count} runs each")
             print(f"Total test runs: {len(runner.tests_config.tests) * len(runner.models_config.models) * runs_count}")
         
-        if args.test:
-            if args.model:
-                # Run specific test against specific model
-                result = runner.run_single_test(args.test, args.model)
-                runner.print_results({args.test: [result]})
+        try:
+            if args.test:
+                if args.model:
+                    # Run specific test against specific model
+                    result = runner.run_single_test(args.test, args.model)
+                    runner.print_results({args.test: [result]})
+                else:
+                    # Run specific test against all configured models
+                    results = runner.run_test(args.test)
+                    runner.print_results({args.test: results})
             else:
-                # Run specific test against all configured models
-                results = runner.run_test(args.test)
-                runner.print_results({args.test: results})
-        else:
-            # Run all tests
-            results = runner.run_all_tests()
-            runner.print_results(results)
+                # Run all tests
+                results = runner.run_all_tests()
+                runner.print_results(results)
+        finally:
+            # Release pooled connections (e.g. persistent Realtime WebSocket sessions)
+            runner.close()
             
     except FileNotFoundError as e:
         print(f"Error: Configuration file not found: {e}")
@@ -1,13 +1,22 @@
 from __future__ import annotations
 from pydantic import BaseModel
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from collections import OrderedDict
+import copy
 import os, yaml
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 class ModelConfig(BaseModel):
     provider: str
     endpoint: str
     api_key: str
     timeout_s: int = 30
+    cache_responses: bool = False  # Reuse responses for identical prompts (opt-in)
 
 class TestConfig(BaseModel):
     name: str
@@ -31,60 +40,111 @@ class TestRunConfig(BaseModel):
     runs_per_test: int = 1  # Default number of runs per test
     tests: Optional[str] = None  # Optional path to test configuration file
 
-def _env_expand(value: str) -> str:
-    # Support ${VAR:-default} and ${VAR} interpolation from the shell-ish syntax in YAML
-    import re
-    def repl(m):
-        key = m.group("key")
-        default = m.group("default")
-        return os.getenv(key, default if default is not None else m.group(0))
-    return re.sub(r"\$\{(?P<key>[A-Z0-9_]+)(?::-(?P<default>[^}]*))?\}", repl, value)
+_ENV_KEY_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+
+def _env_expand(value: str, env: Optional[Dict[str, Optional[str]]] = None) -> str:
+    # Support ${VAR:-default} and ${VAR} interpolation from the shell-ish syntax in YAML.
+    # Single left-to-right scan with str.find; names must match [A-Z0-9_]+ and
+    # anything that isn't a valid reference is copied through unchanged.
+    # `env` memoizes os.environ lookups across one config load.
+    if "${" not in value:
+        return value
+    if env is None:
+        env = {}
+    parts = []
+    copied = 0  # end of the text already copied into parts
+    pos = 0     # where to look for the next "${"
+    while True:
+        start = value.find("${", pos)
+        if start < 0:
+            break
+        end = value.find("}", start + 2)
+        if end < 0:
+            break
+        key, sep, default = value[start + 2:end].partition(":-")
+        if not key or key.strip(_ENV_KEY_CHARS):
+            # Not a reference (e.g. lowercase name); a later "${" may still be one
+            pos = start + 1
+            continue
+        if key in env:
+            found = env[key]
+        else:
+            found = env[key] = os.environ.get(key)
+        parts.append(value[copied:start])
+        if found is not None:
+            parts.append(found)
+        else:
+            parts.append(default if sep else value[start:end + 1])
+        copied = pos = end + 1
+    if not parts:
+        return value
+    parts.append(value[copied:])
+    return "".join(parts)
+
+def _expand_env(obj: Any, env: Optional[Dict[str, Optional[str]]] = None) -> Any:
+    """Expand env vars only for str leaf nodes."""
+    # Containers are only rebuilt when a child changed, so subtrees
+    # without any ${...} are returned as-is
+    if env is None:
+        env = {}
+    if isinstance(obj, str):
+        return _env_expand(obj, env)
+    if isinstance(obj, dict):
+        out = None
+        for k, v in obj.items():
+            new = _expand_env(v, env)
+            if new is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = new
+        return obj if out is None else out
+    if isinstance(obj, list):
+        out = None
+        for i, v in enumerate(obj):
+            new = _expand_env(v, env)
+            if new is not v:
+                if out is None:
+                    out = list(obj)
+                out[i] = new
+        return obj if out is None else out
+    return obj
+
+# Parsed YAML documents keyed by absolute path -> (mtime, size, data)
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+def _load_yaml(path: str) -> Any:
+    """Parse a YAML file, reusing the cached result while the file is unchanged."""
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    cached = _YAML_CACHE.get(abs_path)
+    if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        _YAML_CACHE.move_to_end(abs_path)
+        # Hand out a copy so callers can't mutate the cached document
+        return copy.deepcopy(cached[2])
+
+    with open(abs_path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_SafeLoader)
+    _YAML_CACHE[abs_path] = (st.st_mtime, st.st_size, data)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
 
 def load_app_config(path: str) -> AppConfig:
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    # Expand env vars only for str leaf nodes
-    def walk(obj):
-        if isinstance(obj, dict):
-            return {k: walk(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [walk(x) for x in obj]
-        if isinstance(obj, str):
-            return _env_expand(obj)
-        return obj
-    expanded = walk(data)
-    return AppConfig(**expanded)
+    data = _load_yaml(path)
+    expanded = _expand_env(data, {})
+    return AppConfig.model_validate(expanded)
 
 def load_test_config(path: str) -> TestSuiteConfig:
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    # Expand env vars only for str leaf nodes
-    def walk(obj):
-        if isinstance(obj, dict):
-            return {k: walk(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [walk(x) for x in obj]
-        if isinstance(obj, str):
-            return _env_expand(obj)
-        return obj
-    expanded = walk(data)
-    return TestSuiteConfig(**expanded)
+    data = _load_yaml(path)
+    expanded = _expand_env(data, {})
+    return TestSuiteConfig.model_validate(expanded)
 
 def load_test_run_config(path: str) -> tuple[TestRunConfig, Optional[TestSuiteConfig]]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    # Expand env vars only for str leaf nodes
-    def walk(obj):
-        if isinstance(obj, dict):
-            return {k: walk(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [walk(x) for x in obj]
-        if isinstance(obj, str):
-            return _env_expand(obj)
-        return obj
-    expanded = walk(data)
+    data = _load_yaml(path)
+    expanded = _expand_env(data, {})
     
-    test_run_config = TestRunConfig(**expanded)
+    test_run_config = TestRunConfig.model_validate(expanded)
     
     # Load test suite config if tests field is specified
     test_suite_config = None
@@ -0,0 +1,41 @@
+from __future__ import annotations
+from typing import Dict
+import json
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections per session; also the default generate_many fan-out
+POOL_MAXSIZE = 32
+
+# Only this much of an error body is decoded into the error message
+ERROR_BODY_LIMIT = 512
+
+
+def new_session(headers: Dict[str, str], pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Create a keep-alive session with connector-wide default headers."""
+    session = requests.Session()
+    # Connectors talk to a single host; size the pool for concurrent runs
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers)
+    return session
+
+
+def error_body_excerpt(response: requests.Response) -> str:
+    """Decode a bounded prefix of an error response body.
+
+    Avoids response.text, which decodes (and may charset-sniff) the whole payload.
+    """
+    return response.content[:ERROR_BODY_LIMIT].decode("utf-8", errors="replace")
+
+
+def describe_request_error(exc: Exception) -> str:
+    """Error message for an exception raised while calling or parsing an HTTP API."""
+    if isinstance(exc, requests.exceptions.Timeout):
+        return "Request timeout"
+    if isinstance(exc, requests.exceptions.RequestException):
+        return f"Request error: {str(exc)}"
+    if isinstance(exc, (KeyError, IndexError, json.JSONDecodeError)):
+        return f"Response parsing error: {str(exc)}"
+    return f"Unexpected error: {str(exc)}"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+import json
+from typing import Any
+
+# Use orjson when installed; fall back to the stdlib otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching json.JSONDecodeError with either backend.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes."""
+        return orjson.dumps(obj)
+else:
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
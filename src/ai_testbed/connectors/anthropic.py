@@ -1,50 +1,59 @@
 from __future__ import annotations
-import requests
-import json
+import time
 from typing import Optional
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, _is_effectively_empty, parse_retry_after
+from ._http import POOL_MAXSIZE, describe_request_error, error_body_excerpt, new_session
+from ._json import dumps as json_dumps, loads as json_loads
 
 
 class AnthropicConnector(BaseConnector):
     """Anthropic API connector for Claude models."""
     
+    # One in-flight request per pooled keep-alive connection
+    max_concurrency = POOL_MAXSIZE
+    
+    def __init__(self, model_name: str, endpoint: str, api_key: str, timeout_s: int = 30,
+                 max_retries: int = 3, retry_delay: float = 10.0) -> None:
+        super().__init__(model_name, endpoint, api_key, timeout_s, max_retries, retry_delay)
+        # Keep-alive session so repeated prompts reuse the TCP/TLS connection
+        self._session = new_session({
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        })
+        # Everything but the prompt is fixed per connector, so serialize it once:
+        # {"model": ..., "max_tokens": 1024, "messages": [{"role": "user", "content": <prompt>}]}
+        self._body_prefix = (
+            json_dumps({"model": self.model_name, "max_tokens": 1024})[:-1]
+            + b',"messages":[{"role":"user","content":'
+        )
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self._session.close()
+    
     def _should_retry_empty_response(self, result: GenerateResult, attempt: int) -> bool:
         """Retry on empty responses for Anthropic API calls."""
-        return not result.text or result.text.strip() == ""
+        return _is_effectively_empty(result.text)
 
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Single generation attempt using the Anthropic API."""
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
-            
-            payload = {
-                "model": self.model_name,
-                "max_tokens": 1024,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ]
-            }
+            body = self._body_prefix + json_dumps(prompt) + b"}]}"
             
-            response = requests.post(
+            response = self._session.post(
                 self.endpoint,
-                headers=headers,
-                json=payload,
+                data=body,
                 timeout=self.timeout_s
             )
             
             # Calculate first-byte latency (for HTTP, this is the full response time)
-            first_byte_time = time.time()
-            first_byte_latency_ms = (first_byte_time - start_time) * 1000
+            first_byte_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
             
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 
                 # Extract content from Anthropic response format
                 content = ""
@@ -53,23 +62,19 @@ class AnthropicConnector(BaseConnector):
                 
                 return GenerateResult(text=content, model=self.model_name, first_byte_latency_ms=first_byte_latency_ms)
             else:
+                status_code = response.status_code
+                error_msg = f"API request failed with status {status_code}: {error_body_excerpt(response)}"
+                retry_after_s = None
                 # Include rate limit information in error message
-                error_msg = f"API request failed with status {response.status_code}: {response.text}"
-                if response.status_code == 429:
+                if status_code == 429:
                     retry_after = response.headers.get('Retry-After')
+                    retry_after_s = parse_retry_after(retry_after)
                     if retry_after:
                         error_msg += f" (retry-after: {retry_after} seconds)"
-                return GenerateResult(text="", model=self.model_name, error=error_msg, first_byte_latency_ms=first_byte_latency_ms)
+                return GenerateResult(text="", model=self.model_name, error=error_msg, first_byte_latency_ms=first_byte_latency_ms,
+                                      retry_after_s=retry_after_s, status_code=status_code)
                 
-        except requests.exceptions.Timeout:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error="Request timeout", first_byte_latency_ms=first_byte_latency_ms)
-        except requests.exceptions.RequestException as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Request error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Response parsing error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
         except Exception as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Unexpected error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
+            first_byte_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            return GenerateResult(text="", model=self.model_name, error=describe_request_error(e),
+                                  first_byte_latency_ms=first_byte_latency_ms)
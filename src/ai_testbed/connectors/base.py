@@ -1,20 +1,68 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from hashlib import blake2b
+import re
+import sys
+import threading
 import time
 import random
-from typing import Optional
+from typing import List, Optional, Sequence
 
-@dataclass
+# Matches the "(retry-after: N seconds)" hint connectors append to 429 errors
+_RETRY_AFTER_RE = re.compile(r'retry-after[:\s]+(\d+)', re.IGNORECASE)
+
+# Placeholder keys that mean "not configured" (incl. unexpanded env references)
+_INVALID_API_KEYS = frozenset({"dummy", "test-key", "mock-key", "${OPENAI_API_KEY}", "${ANTHROPIC_API_KEY}"})
+
+def is_placeholder_api_key(key: Optional[str]) -> bool:
+    """True when an API key is missing, blank or a known placeholder value."""
+    return not key or key.isspace() or key in _INVALID_API_KEYS
+
+# Slotted dataclasses for the per-request result records; dataclass(slots=...) needs Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class GenerateResult:
     text: str
     model: str
     error: Optional[str] = None
     first_byte_latency_ms: Optional[float] = None  # First byte latency in milliseconds
+    retry_after_s: Optional[float] = None  # Server-requested delay from a Retry-After header
+    status_code: Optional[int] = None  # HTTP status for failed API responses
+
+def _is_effectively_empty(text: Optional[str]) -> bool:
+    """True for empty or whitespace-only text, without allocating a stripped copy."""
+    # isspace() stops at the first non-whitespace character, so real replies exit early
+    return not text or text.isspace()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (delta-seconds or HTTP-date) to seconds."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
 
 class BaseConnector(ABC):
     """Common interface for all model connectors."""
 
+    # Default worker count for generate_many
+    max_concurrency = 8
+    
+    # Optional shared limiter (anything with acquire()), taken before every request attempt
+    # including retries, so a requests-per-minute cap counts wire requests
+    request_rate_limit = None
+
     def __init__(self, model_name: str, endpoint: str, api_key: str, timeout_s: int = 30, 
                  max_retries: int = 3, retry_delay: float = 10.0) -> None:
         self.model_name = model_name
@@ -24,6 +72,15 @@ class BaseConnector(ABC):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
+        # Classify the provider once; the endpoint doesn't change after construction
+        self._local = "mock://" in endpoint or model_name.startswith(("echo-", "mock-"))
+        if "openai" in endpoint:
+            self._provider_name, self._env_var = "OpenAI", "OPENAI_API_KEY"
+        elif "anthropic" in endpoint:
+            self._provider_name, self._env_var = "Anthropic", "ANTHROPIC_API_KEY"
+        else:
+            self._provider_name, self._env_var = "API", "API_KEY"
+        
         # Validate API key for non-local providers
         self._validate_api_key()
 
@@ -34,7 +91,7 @@ class BaseConnector(ABC):
             return
             
         # Check if API key is missing or invalid
-        if not self.api_key or self.api_key.strip() == "" or self.api_key in ["dummy", "test-key", "mock-key", "${OPENAI_API_KEY}", "${ANTHROPIC_API_KEY}"]:
+        if is_placeholder_api_key(self.api_key):
             provider_name = self._get_provider_name()
             raise ValueError(
                 f"❌ API key is missing or invalid for {provider_name} model '{self.model_name}'\n"
@@ -44,30 +101,15 @@ class BaseConnector(ABC):
 
     def _is_local_provider(self) -> bool:
         """Check if this is a local provider that doesn't need API keys."""
-        return (
-            "mock://" in self.endpoint or 
-            self.endpoint.startswith("mock://") or
-            self.model_name.startswith("echo-") or
-            self.model_name.startswith("mock-")
-        )
+        return self._local
 
     def _get_provider_name(self) -> str:
         """Get human-readable provider name."""
-        if "openai" in self.endpoint:
-            return "OpenAI"
-        elif "anthropic" in self.endpoint:
-            return "Anthropic"
-        else:
-            return "API"
+        return self._provider_name
 
     def _get_env_var_name(self) -> str:
         """Get the environment variable name for this provider."""
-        if "openai" in self.endpoint:
-            return "OPENAI_API_KEY"
-        elif "anthropic" in self.endpoint:
-            return "ANTHROPIC_API_KEY"
-        else:
-            return "API_KEY"
+        return self._env_var
 
     def _should_retry(self, result: GenerateResult, attempt: int) -> bool:
         """Determine if we should retry based on the result and attempt number."""
@@ -105,32 +147,48 @@ class BaseConnector(ABC):
         total_delay = base_delay + jitter
         
         print(f"  ⏳ Retrying in {total_delay:.1f}s (attempt {attempt + 1}/{self.max_retries + 1})...")
-        time.sleep(total_delay)
+        # Sleep against a monotonic deadline so early wakeups don't shorten the wait
+        deadline = time.monotonic() + total_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(remaining)
 
     def generate_with_retry(self, prompt: str) -> GenerateResult:
         """Generate with retry logic for robustness."""
+        # Remote APIs reject empty content; don't spend a round-trip finding out
+        if not prompt and not self._local:
+            return GenerateResult(text="", model=self.model_name, error="Empty prompt")
+        
+        # Single-shot path: no retry bookkeeping needed
+        if self.max_retries <= 0:
+            try:
+                return self._attempt(prompt)
+            except Exception as e:
+                return GenerateResult(
+                    text="",
+                    model=self.model_name,
+                    error=f"Failed after 1 attempts. Last error: Unexpected error on attempt 1: {str(e)}"
+                )
+        
         last_result = None
         rate_limit_delay = 0
         
         for attempt in range(self.max_retries + 1):
             try:
-                result = self._generate_single(prompt)
+                result = self._attempt(prompt)
                 last_result = result
                 
                 # Check for rate limiting
-                if result.error and "429" in result.error:
-                    # Extract retry-after from error message if available
-                    if "retry-after" in result.error.lower():
-                        try:
-                            # Look for retry-after value in error message
-                            import re
-                            match = re.search(r'retry-after[:\s]+(\d+)', result.error, re.IGNORECASE)
-                            if match:
-                                rate_limit_delay = float(match.group(1))
-                        except:
-                            rate_limit_delay = 60  # Default 60 seconds
+                if result.status_code == 429 or (result.error and "429" in result.error):
+                    if result.retry_after_s is not None:
+                        # Connector passed the Retry-After header through
+                        rate_limit_delay = result.retry_after_s
                     else:
-                        rate_limit_delay = 60  # Default 60 seconds
+                        # Extract retry-after from error message if available
+                        match = _RETRY_AFTER_RE.search(result.error or "")
+                        rate_limit_delay = float(match.group(1)) if match else 60  # Default 60 seconds
                     
                     print(f"  🚫 Rate limited detected: {result.error}")
                 
@@ -168,6 +226,12 @@ class BaseConnector(ABC):
         
         return last_result
 
+    def _attempt(self, prompt: str) -> GenerateResult:
+        """One request attempt, throttled by request_rate_limit when set."""
+        if self.request_rate_limit is not None:
+            self.request_rate_limit.acquire()
+        return self._generate_single(prompt)
+
     @abstractmethod
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Single generation attempt without retry logic."""
@@ -176,3 +240,54 @@ class BaseConnector(ABC):
     def generate(self, prompt: str) -> GenerateResult:
         """Public interface that uses retry logic."""
         return self.generate_with_retry(prompt)
+
+    def close(self) -> None:
+        """Release network resources held by the connector (no-op by default)."""
+
+    def generate_many(self, prompts: Sequence[str], concurrency: Optional[int] = None) -> List[GenerateResult]:
+        """Generate responses for several prompts concurrently, preserving input order."""
+        if concurrency is None:
+            concurrency = self.max_concurrency
+        if len(prompts) <= 1 or concurrency <= 1:
+            return [self.generate(p) for p in prompts]
+        # Calls are network-bound, so threads overlap the request latency
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as executor:
+            return list(executor.map(self.generate, prompts))
+
+
+class ResponseCacheMixin:
+    """Memoize successful generate() results when ``cache_responses`` is enabled.
+
+    Off by default: caching hides run-to-run variation, which is exactly what a
+    determinism test is trying to measure.
+    """
+
+    cache_responses: bool = False
+    response_cache_maxsize = 1024
+
+    # Class-level so every pooled connector of the same class shares one cache; keys
+    # include model and endpoint, so different model configs never collide
+    _response_cache: "OrderedDict[bytes, GenerateResult]" = OrderedDict()
+    _response_cache_lock = threading.Lock()
+
+    def generate(self, prompt: str) -> GenerateResult:
+        if not self.cache_responses:
+            return super().generate(prompt)
+
+        key = blake2b(f"{self.model_name}|{self.endpoint}|{prompt}".encode(), digest_size=16).digest()
+        cache = ResponseCacheMixin._response_cache
+        with ResponseCacheMixin._response_cache_lock:
+            hit = cache.get(key)
+            if hit is not None:
+                cache.move_to_end(key)
+        if hit is not None:
+            # Hand out a copy so callers can't mutate the cached entry
+            return replace(hit)
+
+        result = super().generate(prompt)
+        if result.error is None:
+            with ResponseCacheMixin._response_cache_lock:
+                cache[key] = replace(result)
+                if len(cache) > self.response_cache_maxsize:
+                    cache.popitem(last=False)
+        return result
@@ -1,8 +1,8 @@
 from __future__ import annotations
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, ResponseCacheMixin
 
 
-class EchoConnector(BaseConnector):
+class EchoConnector(ResponseCacheMixin, BaseConnector):
     """Echo connector that simply returns the input prompt as output."""
     
     def _generate_single(self, prompt: str) -> GenerateResult:
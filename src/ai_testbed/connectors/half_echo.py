@@ -1,8 +1,8 @@
 from __future__ import annotations
 from typing import Optional
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, ResponseCacheMixin
 
-class HalfEchoConnector(BaseConnector):
+class HalfEchoConnector(ResponseCacheMixin, BaseConnector):
     """Mock connector that returns the first half of the input text."""
     
     def __init__(self, model_name: str = "half-echo", endpoint: str = "mock://half-echo", 
@@ -11,22 +11,6 @@ class HalfEchoConnector(BaseConnector):
     
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Generate response by returning the first half of the input text."""
-        try:
-            # Calculate the midpoint
-            text_length = len(prompt)
-            half_length = text_length // 2
-            
-            # Return the first half of the text
-            response_text = prompt[:half_length]
-            
-            return GenerateResult(
-                text=response_text,
-                model=self.model_name,
-                error=None
-            )
-        except Exception as e:
-            return GenerateResult(
-                text="",
-                model=self.model_name,
-                error=f"HalfEcho generation failed: {str(e)}"
-            )
+        # Return the first half of the text; slicing a str can't fail
+        response_text = prompt[:len(prompt) // 2]
+        return GenerateResult(text=response_text, model=self.model_name, error=None)
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, ResponseCacheMixin
 
-class MockConnector(BaseConnector):
+class MockConnector(ResponseCacheMixin, BaseConnector):
     """Deterministic stub to simulate a model call without network."""
 
     def _generate_single(self, prompt: str) -> GenerateResult:
@@ -11,5 +11,5 @@ class MockConnector(BaseConnector):
             reply = prompt
         else:
             # Return first 10 characters of input text for other models
-            reply = prompt[:10] if len(prompt) >= 10 else prompt
+            reply = prompt[:10]  # Shorter prompts come back as-is, without a copy
         return GenerateResult(text=reply, model=self.model_name, error=None)
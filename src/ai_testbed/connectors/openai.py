@@ -1,13 +1,43 @@
 from __future__ import annotations
-import requests
-import json
+import time
 from typing import Optional
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, ResponseCacheMixin, _is_effectively_empty, parse_retry_after
+from ._http import POOL_MAXSIZE, describe_request_error, error_body_excerpt, new_session
+from ._json import dumps as json_dumps, loads as json_loads
 
 
-class OpenAIConnector(BaseConnector):
+class OpenAIConnector(ResponseCacheMixin, BaseConnector):
     """OpenAI API connector for GPT models."""
     
+    # One in-flight request per pooled keep-alive connection
+    max_concurrency = POOL_MAXSIZE
+    
+    def __init__(self, model_name: str, endpoint: str, api_key: str, timeout_s: int = 30,
+                 max_retries: int = 3, retry_delay: float = 10.0) -> None:
+        super().__init__(model_name, endpoint, api_key, timeout_s, max_retries, retry_delay)
+        # Keep-alive session so repeated prompts reuse the TCP/TLS connection
+        self._session = new_session({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        # Endpoint-invariant request state, so each call only adds the prompt
+        # API flavor is fixed by the endpoint: bind the matching payload builder and parser once
+        self._is_responses_api = "/v1/responses" in endpoint
+        if self._is_responses_api:
+            # Responses API format - simplified parameters
+            self._base_payload = {"model": model_name}
+            self._build_payload = self._responses_payload
+            self._extract_text = self._responses_text
+        else:
+            # Chat completions API format
+            self._base_payload = {"model": model_name, "max_tokens": 1000, "temperature": 0.7}
+            self._build_payload = self._chat_payload
+            self._extract_text = self._chat_text
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self._session.close()
+    
     def _should_retry_empty_response(self, result: GenerateResult, attempt: int) -> bool:
         """Retry on empty responses for OpenAI API calls, but not on authentication errors."""
         # Don't retry if there's an error (authentication, etc.)
@@ -15,87 +45,62 @@ class OpenAIConnector(BaseConnector):
             return False
         
         # Only retry on truly empty responses (no error)
-        return not result.text or result.text.strip() == ""
+        return _is_effectively_empty(result.text)
+
+    def _chat_payload(self, prompt: str) -> dict:
+        return {**self._base_payload, "messages": [{"role": "user", "content": prompt}]}
+
+    def _responses_payload(self, prompt: str) -> dict:
+        return {**self._base_payload, "input": prompt}
+
+    @staticmethod
+    def _chat_text(data: dict) -> str:
+        return data["choices"][0]["message"]["content"]
+
+    @staticmethod
+    def _responses_text(data: dict) -> str:
+        """First non-empty output_text of a message item in a Responses API reply."""
+        output = data.get("output")
+        return next(
+            (content_item["text"]
+             for item in (output if isinstance(output, list) else ())
+             if item.get("type") == "message"
+             for content_item in item.get("content", ())
+             if content_item.get("type") == "output_text" and content_item.get("text")),
+            ""
+        )
 
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Single generation attempt using the OpenAI API."""
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            # Check if this is the responses API endpoint
-            if "/v1/responses" in self.endpoint:
-                # Responses API format - simplified parameters
-                payload = {
-                    "model": self.model_name,
-                    "input": prompt
-                }
-            else:
-                # Chat completions API format
-                payload = {
-                    "model": self.model_name,
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 1000,
-                    "temperature": 0.7
-                }
-            
-            response = requests.post(
+            response = self._session.post(
                 self.endpoint,
-                headers=headers,
-                json=payload,
+                data=json_dumps(self._build_payload(prompt)),
                 timeout=self.timeout_s
             )
             
             # Calculate first-byte latency (for HTTP, this is the full response time)
-            first_byte_time = time.time()
-            first_byte_latency_ms = (first_byte_time - start_time) * 1000
+            first_byte_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
             
             if response.status_code == 200:
-                data = response.json()
-                
-                # Check if this is the responses API format
-                if "/v1/responses" in self.endpoint:
-                    # Responses API format - extract text from the complex response
-                    content = ""
-                    if "output" in data and isinstance(data["output"], list):
-                        for item in data["output"]:
-                            if item.get("type") == "message" and "content" in item:
-                                for content_item in item["content"]:
-                                    if content_item.get("type") == "output_text":
-                                        content = content_item.get("text", "")
-                                        break
-                                if content:
-                                    break
-                else:
-                    # Chat completions API format
-                    content = data["choices"][0]["message"]["content"]
-                
+                content = self._extract_text(json_loads(response.content))
                 return GenerateResult(text=content, model=self.model_name, first_byte_latency_ms=first_byte_latency_ms)
             else:
+                status_code = response.status_code
+                error_msg = f"API request failed with status {status_code}: {error_body_excerpt(response)}"
+                retry_after_s = None
                 # Include rate limit information in error message
-                error_msg = f"API request failed with status {response.status_code}: {response.text}"
-                if response.status_code == 429:
+                if status_code == 429:
                     retry_after = response.headers.get('Retry-After')
+                    retry_after_s = parse_retry_after(retry_after)
                     if retry_after:
                         error_msg += f" (retry-after: {retry_after} seconds)"
-                return GenerateResult(text="", model=self.model_name, error=error_msg, first_byte_latency_ms=first_byte_latency_ms)
+                return GenerateResult(text="", model=self.model_name, error=error_msg, first_byte_latency_ms=first_byte_latency_ms,
+                                      retry_after_s=retry_after_s, status_code=status_code)
                 
-        except requests.exceptions.Timeout:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error="Request timeout", first_byte_latency_ms=first_byte_latency_ms)
-        except requests.exceptions.RequestException as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Request error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Response parsing error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
         except Exception as e:
-            first_byte_latency_ms = (time.time() - start_time) * 1000
-            return GenerateResult(text="", model=self.model_name, error=f"Unexpected error: {str(e)}", first_byte_latency_ms=first_byte_latency_ms)
+            first_byte_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            return GenerateResult(text="", model=self.model_name, error=describe_request_error(e),
+                                  first_byte_latency_ms=first_byte_latency_ms)
@@ -1,17 +1,42 @@
 from __future__ import annotations
-import requests
-import json
-import time
 from typing import Optional
-from .base import BaseConnector, GenerateResult
+from .base import BaseConnector, GenerateResult, ResponseCacheMixin, _is_effectively_empty
+from ._http import POOL_MAXSIZE, describe_request_error, new_session
+from ._json import dumps as json_dumps, loads as json_loads
 
 
-class OpenAIRealtimeConnector(BaseConnector):
+class OpenAIRealtimeConnector(ResponseCacheMixin, BaseConnector):
     """OpenAI Realtime API connector for realtime preview models."""
     
+    # One in-flight request per pooled keep-alive connection
+    max_concurrency = POOL_MAXSIZE
+    
+    def __init__(self, model_name: str, endpoint: str, api_key: str, timeout_s: int = 30,
+                 max_retries: int = 3, retry_delay: float = 10.0) -> None:
+        super().__init__(model_name, endpoint, api_key, timeout_s, max_retries, retry_delay)
+        # Keep-alive session so repeated prompts reuse the TCP/TLS connection
+        self._session = new_session({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        # Map realtime model names to their standard equivalents
+        model_mapping = {
+            "gpt-4o-mini-realtime-preview": "gpt-4o-mini",
+            "gpt-4o-realtime-preview": "gpt-4o"
+        }
+        self._base_payload = {
+            "model": model_mapping.get(model_name, "gpt-4o-mini"),
+            "max_tokens": 1000,
+            "temperature": 0.7
+        }
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self._session.close()
+    
     def _should_retry_empty_response(self, result: GenerateResult, attempt: int) -> bool:
         """Retry on empty responses for OpenAI Realtime API calls."""
-        return not result.text or result.text.strip() == ""
+        return _is_effectively_empty(result.text)
 
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Single generation attempt using the OpenAI Realtime API (fallback to standard API)."""
@@ -19,49 +44,22 @@ class OpenAIRealtimeConnector(BaseConnector):
             # Fallback to standard chat completions API for compatibility
             # For true realtime WebSocket support, use openai-realtime-ws provider
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            # Map realtime model names to their standard equivalents
-            model_mapping = {
-                "gpt-4o-mini-realtime-preview": "gpt-4o-mini",
-                "gpt-4o-realtime-preview": "gpt-4o"
-            }
-            
-            standard_model = model_mapping.get(self.model_name, "gpt-4o-mini")
-            
-            payload = {
-                "model": standard_model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            }
+            payload = {**self._base_payload, "messages": [{"role": "user", "content": prompt}]}
             
             # Use the standard chat completions endpoint
-            response = requests.post(
+            response = self._session.post(
                 "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
+                data=json_dumps(payload),
                 timeout=self.timeout_s
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 content = data["choices"][0]["message"]["content"]
                 return GenerateResult(text=content, model=self.model_name)
             else:
                 error_msg = f"API request failed with status {response.status_code}: {response.text}"
                 return GenerateResult(text="", model=self.model_name, error=error_msg)
                 
-        except requests.exceptions.Timeout:
-            return GenerateResult(text="", model=self.model_name, error="Request timeout")
-        except requests.exceptions.RequestException as e:
-            return GenerateResult(text="", model=self.model_name, error=f"Request error: {str(e)}")
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            return GenerateResult(text="", model=self.model_name, error=f"Response parsing error: {str(e)}")
         except Exception as e:
-            return GenerateResult(text="", model=self.model_name, error=f"Unexpected error: {str(e)}")
+            return GenerateResult(text="", model=self.model_name, error=describe_request_error(e))
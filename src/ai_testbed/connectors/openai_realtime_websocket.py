@@ -1,10 +1,19 @@
 from __future__ import annotations
 import websocket
 import json
+import logging
 import threading
 import time
-from typing import Optional
-from .base import BaseConnector, GenerateResult
+from typing import List, Optional
+from .base import BaseConnector, GenerateResult, _is_effectively_empty
+from ._json import dumps as json_dumps, loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+
+def _debug() -> bool:
+    """Cheap check used to skip building per-frame log arguments."""
+    return logger.isEnabledFor(logging.DEBUG)
 
 
 class OpenAIRealtimeWebSocketConnector(BaseConnector):
@@ -13,219 +22,264 @@ class OpenAIRealtimeWebSocketConnector(BaseConnector):
     def __init__(self, model_name: str = "gpt-4o-realtime-preview", endpoint: str = "wss://api.openai.com/v1/realtime", 
                  api_key: str = "", timeout_s: int = 30, max_retries: int = 3, retry_delay: float = 10.0):
         super().__init__(model_name, endpoint, api_key, timeout_s, max_retries, retry_delay)
-        self.response_received = False
+        self._done = threading.Event()  # Set once a response, error or close arrives
+        self._session_ready = threading.Event()  # Set on session.created
         self.response_text = ""
+        self._response_parts: List[str] = []  # Streamed deltas, joined once on completion
         self.response_error = None
         self.websocket = None
         self.session_id = None
         self.first_byte_time = None  # Track when first response data arrives
+        self._ws_thread = None
+        # One request at a time on the shared connection
+        self._lock = threading.Lock()
+        # Message type -> handler for the realtime API events we act on
+        self._handlers = {
+            "session.created": self._h_session_created,
+            "response.output_text.delta": self._h_output_text_delta,
+            "response.content_block.delta": self._h_content_block_delta,
+            "response.audio_transcript.done": self._h_audio_transcript_done,
+            "response.completed": self._h_response_done,
+            "response.done": self._h_response_done,
+            "error": self._h_error,
+        }
         
     def _should_retry_empty_response(self, result: GenerateResult, attempt: int) -> bool:
         """Retry on empty responses for OpenAI Realtime API calls."""
-        return not result.text or result.text.strip() == ""
+        return _is_effectively_empty(result.text)
     
     def _on_message(self, ws, message):
         """Handle incoming WebSocket messages."""
+        if self._done.is_set() and self.session_id:
+            # Trailing frames of a finished response (late audio/transcript events) are dropped
+            # unparsed; a reconnect clears session_id so session.created still gets through
+            return
         try:
-            data = json.loads(message)
-            # print(f"📨 Received message type: {data.get('type', 'unknown')} - {data}")  # Debug output
+            data = json_loads(message)
+            if _debug():
+                logger.debug("Received message type %s: %s", data.get("type", "unknown"), data)
             
-            # Handle different message types from the realtime API
-            if data.get("type") == "session.created":
-                # Session created, store session ID
-                self.session_id = data.get("session", {}).get("id")
-                # print(f"✅ Session created with ID: {self.session_id}")
-            elif data.get("type") == "session.update":
-                # print(f"📝 Session update received: {data}")
-                pass
-            elif data.get("type") == "conversation.item.create":
-                # print(f"💬 Conversation item created: {data}")
-                pass
-            elif data.get("type") == "response.create":
-                # print(f"🚀 Response create received: {data}")
-                pass
-            elif data.get("type") == "response.output_text.delta":
-                # Newer text delta event - capture first byte timing
-                if self.first_byte_time is None:
-                    self.first_byte_time = time.time()
-                delta_text = data.get("delta", "")
-                self.response_text += delta_text
-                # print(f"📝 Text delta: '{delta_text}' | Accumulated: '{self.response_text}'")
-            elif data.get("type") == "response.content_block.delta":
-                # Older-style content block deltas - capture first byte timing
-                if self.first_byte_time is None:
-                    self.first_byte_time = time.time()
-                delta = data.get("delta", {})
-                if isinstance(delta, dict) and "text" in delta:
-                    self.response_text += delta["text"]
-                    # print(f"📝 Content block delta: '{delta['text']}' | Accumulated: '{self.response_text}'")
-            elif data.get("type") == "response.audio_transcript.done":
-                # Handle audio responses by extracting transcript - capture first byte timing
-                if self.first_byte_time is None:
-                    self.first_byte_time = time.time()
-                transcript = data.get("transcript", "")
-                if transcript:
-                    self.response_text = transcript
-                    # print(f"🎵 Audio transcript: '{transcript}'")
-            elif data.get("type") == "response.audio.delta":
-                # Handle audio delta events (ignore for now)
-                pass
-            elif data.get("type") == "response.audio.done":
-                # Handle audio done events (ignore for now)
-                pass
-            elif data.get("type") in ("response.completed", "response.done"):
-                # print(f"✅ Response completed! Final text: '{self.response_text}'")
-                self.response_received = True
-            elif data.get("type") == "error":
-                # Handle errors
-                error_msg = data.get("error", {}).get("message", "Unknown error")
-                # print(f"❌ Error: {error_msg}")
-                self.response_error = error_msg
-                self.response_received = True
-            else:
-                # print(f"❓ Unknown message type: {data.get('type', 'unknown')}")
-                pass
+            # One dict lookup per frame; unhandled types (session.update, audio deltas, ...) are ignored
+            handler = self._handlers.get(data.get("type"))
+            if handler is not None:
+                handler(data)
                 
         except json.JSONDecodeError as e:
             self.response_error = f"Failed to parse WebSocket message: {str(e)}"
-            self.response_received = True
-            # print(f"Failed to parse WebSocket message: {str(e)}")
+            self._done.set()
+            logger.debug("Failed to parse WebSocket message: %s", e)
         except Exception as e:
             self.response_error = f"Error processing WebSocket message: {str(e)}"
-            self.response_received = True
-            # print(f"Error processing WebSocket message: {str(e)}")
+            self._done.set()
+            logger.debug("Error processing WebSocket message: %s", e)
+    
+    def _h_session_created(self, data: dict) -> None:
+        """Session created, store session ID."""
+        self.session_id = data.get("session", {}).get("id")
+        self._session_ready.set()
+        logger.debug("Session created with ID: %s", self.session_id)
+    
+    def _h_output_text_delta(self, data: dict) -> None:
+        """Newer text delta event - capture first byte timing."""
+        if self.first_byte_time is None:
+            self.first_byte_time = time.time()
+        self._response_parts.append(data.get("delta", ""))
+    
+    def _h_content_block_delta(self, data: dict) -> None:
+        """Older-style content block deltas - capture first byte timing."""
+        if self.first_byte_time is None:
+            self.first_byte_time = time.time()
+        delta = data.get("delta", {})
+        if isinstance(delta, dict) and "text" in delta:
+            self._response_parts.append(delta["text"])
+    
+    def _h_audio_transcript_done(self, data: dict) -> None:
+        """Handle audio responses by extracting transcript - capture first byte timing."""
+        if self.first_byte_time is None:
+            self.first_byte_time = time.time()
+        transcript = data.get("transcript", "")
+        if transcript:
+            self._response_parts = [transcript]
+    
+    def _h_response_done(self, data: dict) -> None:
+        self.response_text = "".join(self._response_parts)
+        logger.debug("Response completed, final text: %r", self.response_text)
+        self._done.set()
+    
+    def _h_error(self, data: dict) -> None:
+        error_msg = data.get("error", {}).get("message", "Unknown error")
+        logger.debug("Realtime API error: %s", error_msg)
+        self.response_error = error_msg
+        self._done.set()
     
     def _on_error(self, ws, error):
         """Handle WebSocket errors."""
+        if ws is not self.websocket:
+            return  # Late callback from a connection we already dropped
         error_msg = f"WebSocket error: {str(error)}"
-        # print(f"❌ WebSocket error: {error_msg}")
+        logger.debug("%s", error_msg)
         self.response_error = error_msg
-        self.response_received = True
+        self._done.set()
+        self._session_ready.set()  # Don't keep waiting for a session that won't arrive
     
     def _on_close(self, ws, close_status_code, close_msg):
         """Handle WebSocket close."""
-        # print(f"🔌 WebSocket closed - Status: {close_status_code}, Message: {close_msg}")
-        if not self.response_received and not self.response_error:
+        logger.debug("WebSocket closed - status: %s, message: %s", close_status_code, close_msg)
+        if ws is not self.websocket:
+            return  # Late callback from a connection we already dropped
+        self.session_id = None  # Forces a reconnect on the next prompt
+        if not self._done.is_set() and not self.response_error:
             error_msg = "WebSocket connection closed unexpectedly"
-            # print(f"❌ {error_msg}")
             self.response_error = error_msg
-            self.response_received = True
+            self._done.set()
+        self._session_ready.set()
     
     def _on_open(self, ws):
         """Handle WebSocket open."""
-        # print("🔌 WebSocket connection opened")
+        logger.debug("WebSocket connection opened")
         # Send session update message to initialize the session
         # Note: We'll send the actual session update after we get the session ID
         pass
     
+    def _ensure_connected(self) -> Optional[str]:
+        """Open the WebSocket and wait for session.created unless a live session exists.
+
+        Returns an error message if no session could be established.
+        """
+        if self.session_id and self._ws_thread is not None and self._ws_thread.is_alive():
+            return None
+        self._disconnect()
+        self._done.clear()
+        self._session_ready.clear()
+        self.response_error = None
+
+        ws_url = f"{self.endpoint}?model={self.model_name}"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "OpenAI-Beta": "realtime=v1"
+        }
+        logger.debug("Connecting to %s", ws_url)
+
+        ws = websocket.WebSocketApp(
+            ws_url,
+            header=headers,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+            on_open=self._on_open
+        )
+        self.websocket = ws
+
+        # Keepalive helps some networks and keeps idle sessions open between prompts
+        self._ws_thread = threading.Thread(
+            # Text frames stay raw UTF-8 bytes; the JSON parser validates them while decoding
+            target=lambda: ws.run_forever(
+                ping_interval=20, ping_timeout=10, skip_utf8_validation=True
+            )
+        )
+        self._ws_thread.daemon = True
+        self._ws_thread.start()
+
+        # Wait for session.created
+        session_timeout = 5
+        self._session_ready.wait(session_timeout)
+
+        if not self.session_id:
+            logger.debug("Session creation timed out after %ss", session_timeout)
+            self._disconnect()
+            return "Failed to create session within timeout"
+        logger.debug("Session ready: %s", self.session_id)
+        return None
+
+    def _disconnect(self) -> None:
+        """Close the current WebSocket, if any, and wait for its thread to exit."""
+        ws, thread = self.websocket, self._ws_thread
+        self.websocket = None
+        self._ws_thread = None
+        self.session_id = None
+        if ws is not None:
+            ws.close()
+        if thread is not None:
+            thread.join(timeout=3)
+
+    def close(self) -> None:
+        """Close the persistent WebSocket session."""
+        with self._lock:
+            self._disconnect()
+
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Single generation attempt using the OpenAI Realtime WebSocket API."""
-        # print(f"🚀 Starting generation for prompt: '{prompt[:50]}...'")
-        try:
-            # Reset state
-            self.response_received = False
-            self.response_text = ""
-            self.response_error = None
-            self.session_id = None  # ← ensure fresh for each run
-            self.first_byte_time = None  # ← reset first byte timing
-            # print("🔄 State reset complete")
-
-            ws_url = f"{self.endpoint}?model={self.model_name}"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "OpenAI-Beta": "realtime=v1"
-            }
-            # print(f"🌐 Connecting to: {ws_url}")
-            # print(f"🔑 Using API key: {self.api_key[:10]}...{self.api_key[-4:] if len(self.api_key) > 14 else '***'}")
-
-            self.websocket = websocket.WebSocketApp(
-                ws_url,
-                header=headers,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close,
-                on_open=self._on_open
-            )
+        with self._lock:
+            try:
+                error = self._ensure_connected()
+                if error:
+                    return GenerateResult(text="", model=self.model_name, error=error)
 
-            # Keepalive helps some networks
-            ws_thread = threading.Thread(
-                target=lambda: self.websocket.run_forever(ping_interval=20, ping_timeout=10)
-            )
-            ws_thread.daemon = True
-            ws_thread.start()
-            # print("🧵 WebSocket thread started")
-
-            # Wait for session.created
-            session_timeout = 5
-            start_time = time.time()
-            # print(f"⏳ Waiting for session creation (timeout: {session_timeout}s)...")
-            while not self.session_id and (time.time() - start_time) < session_timeout:
-                time.sleep(0.05)
-
-            if not self.session_id:
-                # print("❌ Session creation timeout!")
-                return GenerateResult(text="", model=self.model_name,
-                                      error="Failed to create session within timeout")
-            # print(f"✅ Session ready: {self.session_id}")
-
-            # 1) Send the user item
-            user_message = {
-                "type": "conversation.item.create",
-                "item": {
-                    "type": "message",
-                    "role": "user",
-                    "content": [{"type": "input_text", "text": prompt}]
+                # Reset per-request state; the session itself is reused
+                self._done.clear()
+                self.response_text = ""
+                self._response_parts = []
+                self.response_error = None
+                self.first_byte_time = None  # ← reset first byte timing
+
+                # Out-of-band response: the prompt is passed as the response input instead
+                # of being appended to the session conversation, so earlier prompts on this
+                # connection never become context for later ones
+                response_create = {
+                    "type": "response.create",
+                    "response": {
+                        "conversation": "none",
+                        "input": [{
+                            "type": "message",
+                            "role": "user",
+                            "content": [{"type": "input_text", "text": prompt}]
+                        }]
+                        # Optionally: "temperature": 0
+                    }
                 }
-            }
-            # print(f"📤 Sending user message: {user_message}")
-            self.websocket.send(json.dumps(user_message))
-
-            # 2) Explicitly trigger inference for text-only flows
-            response_create = {
-                "type": "response.create"
-                # Optionally: "response": {"temperature": 0}
-            }
-            # print(f"📤 Sending response.create: {response_create}")
-            self.websocket.send(json.dumps(response_create))
-
-            # Wait for response
-            # print(f"⏳ Waiting for response (timeout: {self.timeout_s}s)...")
-            start_time = time.time()
-            while not self.response_received and (time.time() - start_time) < self.timeout_s:
-                time.sleep(0.05)
-
-            # print(f"🔌 Closing WebSocket connection...")
-            # Close and join
-            if self.websocket:
-                self.websocket.close()
-            ws_thread.join(timeout=3)
-            # print(f"🧵 WebSocket thread joined")
-
-            # Calculate first-byte latency
-            first_byte_latency_ms = None
-            if self.first_byte_time is not None:
-                first_byte_latency_ms = (self.first_byte_time - start_time) * 1000
-
-            if not self.response_received and not self.response_error:
-                # print(f"❌ Request timeout after {self.timeout_s} seconds")
-                return GenerateResult(text="", model=self.model_name,
-                                      error=f"Request timeout after {self.timeout_s} seconds",
-                                      first_byte_latency_ms=first_byte_latency_ms)
+                frame = json_dumps(response_create)
+                try:
+                    self.websocket.send(frame)
+                except (websocket.WebSocketException, OSError):
+                    # The idle socket went stale between prompts; reconnect once and resend
+                    logger.debug("Send on idle WebSocket failed, reconnecting", exc_info=True)
+                    self._disconnect()
+                    error = self._ensure_connected()
+                    if error:
+                        return GenerateResult(text="", model=self.model_name, error=error)
+                    self._done.clear()
+                    self.response_error = None
+                    self.websocket.send(frame)
 
-            if self.response_error:
-                # print(f"❌ Response error: {self.response_error}")
-                return GenerateResult(text="", model=self.model_name, error=self.response_error,
-                                      first_byte_latency_ms=first_byte_latency_ms)
+                # Wait for response
+                start_time = time.time()
+                finished = self._done.wait(self.timeout_s)
 
-            # print(f"✅ Success! Final response: '{self.response_text}'")
-            return GenerateResult(text=self.response_text, model=self.model_name,
-                                  first_byte_latency_ms=first_byte_latency_ms)
+                # Calculate first-byte latency
+                first_byte_latency_ms = None
+                if self.first_byte_time is not None:
+                    first_byte_latency_ms = (self.first_byte_time - start_time) * 1000
 
-        except Exception as e:
-            # print(f"❌ Exception in _generate_single: {str(e)}")
-            return GenerateResult(text="", model=self.model_name,
-                                  error=f"WebSocket connection error: {str(e)}",
-                                  first_byte_latency_ms=None)
-        finally:
-            # print("🧹 Cleaning up session_id")
-            self.session_id = None  # ← avoid bleed into next call
+                if not finished or self.response_error:
+                    # Late events from this response must not leak into the next one
+                    self._disconnect()
+
+                if not finished and not self.response_error:
+                    logger.debug("Request timeout after %s seconds", self.timeout_s)
+                    return GenerateResult(text="", model=self.model_name,
+                                          error=f"Request timeout after {self.timeout_s} seconds",
+                                          first_byte_latency_ms=first_byte_latency_ms)
+
+                if self.response_error:
+                    return GenerateResult(text="", model=self.model_name, error=self.response_error,
+                                          first_byte_latency_ms=first_byte_latency_ms)
+
+                return GenerateResult(text=self.response_text, model=self.model_name,
+                                      first_byte_latency_ms=first_byte_latency_ms)
+
+            except Exception as e:
+                logger.debug("WebSocket request failed", exc_info=True)
+                self._disconnect()
+                return GenerateResult(text="", model=self.model_name,
+                                      error=f"WebSocket connection error: {str(e)}",
+                                      first_byte_latency_ms=None)
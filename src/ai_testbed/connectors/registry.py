@@ -1,37 +1,42 @@
 from __future__ import annotations
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, Tuple, Type
 from .base import BaseConnector
-from .mock import MockConnector
-from .openai import OpenAIConnector
-from .echo import EchoConnector
-from .anthropic import AnthropicConnector
-from .openai_realtime import OpenAIRealtimeConnector
-from .openai_realtime_websocket import OpenAIRealtimeWebSocketConnector
-from .half_echo import HalfEchoConnector
-from .reverse_echo import ReverseEchoConnector
 
-# Map provider id -> connector class
-PROVIDERS: Dict[str, Type[BaseConnector]] = {
-    "mock": MockConnector,
-    "openai": OpenAIConnector,
-    "echo": EchoConnector,
-    "anthropic": AnthropicConnector,
-    "openai-realtime": OpenAIRealtimeConnector,
-    "openai-realtime-ws": OpenAIRealtimeWebSocketConnector,
-    "half-echo": HalfEchoConnector,
-    "reverse-echo": ReverseEchoConnector,
+# Map provider id -> (connector module, class name). Modules are imported on first
+# use so a mock-only run never loads requests or websocket-client.
+PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "mock": ("mock", "MockConnector"),
+    "openai": ("openai", "OpenAIConnector"),
+    "echo": ("echo", "EchoConnector"),
+    "anthropic": ("anthropic", "AnthropicConnector"),
+    "openai-realtime": ("openai_realtime", "OpenAIRealtimeConnector"),
+    "openai-realtime-ws": ("openai_realtime_websocket", "OpenAIRealtimeWebSocketConnector"),
+    "half-echo": ("half_echo", "HalfEchoConnector"),
+    "reverse-echo": ("reverse_echo", "ReverseEchoConnector"),
 }
 
+_resolved: Dict[str, Type[BaseConnector]] = {}
+
+def get_connector_class(provider: str) -> Type[BaseConnector]:
+    """Resolve (and cache) the connector class registered for a provider id."""
+    impl = _resolved.get(provider)
+    if impl is None:
+        if provider not in PROVIDERS:
+            raise ValueError(f"No connector registered for provider '{provider}'")
+        module_name, class_name = PROVIDERS[provider]
+        impl = getattr(import_module(f".{module_name}", __package__), class_name)
+        _resolved[provider] = impl
+    return impl
+
 def create_connector(model_name: str, cfg) -> BaseConnector:
     if model_name not in cfg.models:
         raise KeyError(f"Unknown model: {model_name}")
     mc = cfg.models[model_name]
-    impl = PROVIDERS.get(mc.provider)
-    if impl is None:
-        raise ValueError(f"No connector registered for provider '{mc.provider}'")
+    impl = get_connector_class(mc.provider)
     
     # Create connector with retry parameters
-    return impl(
+    connector = impl(
         model_name=model_name, 
         endpoint=mc.endpoint, 
         api_key=mc.api_key, 
@@ -39,3 +44,6 @@ def create_connector(model_name: str, cfg) -> BaseConnector:
         max_retries=3,  # Default retry count
         retry_delay=10.0  # Default 10 second base delay
     )
+    if mc.cache_responses:
+        connector.cache_responses = True
+    return connector
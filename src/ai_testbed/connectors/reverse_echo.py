@@ -1,5 +1,4 @@
 from __future__ import annotations
-from typing import Optional
 from .base import BaseConnector, GenerateResult
 
 class ReverseEchoConnector(BaseConnector):
@@ -11,18 +10,5 @@ class ReverseEchoConnector(BaseConnector):
     
     def _generate_single(self, prompt: str) -> GenerateResult:
         """Generate response by returning the input text reversed."""
-        try:
-            # Return the text reversed
-            response_text = prompt[::-1]
-            
-            return GenerateResult(
-                text=response_text,
-                model=self.model_name,
-                error=None
-            )
-        except Exception as e:
-            return GenerateResult(
-                text="",
-                model=self.model_name,
-                error=f"ReverseEcho generation failed: {str(e)}"
-            )
+        # Slicing a str can't fail, so no error handling is needed here
+        return GenerateResult(text=prompt[::-1], model=self.model_name, error=None)
@@ -1,46 +1,110 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Optional
+from typing import Deque, Dict, List, TextIO, Tuple, Optional
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from itertools import chain
+import io
+import re
+import sys
 import time
 import colorama
 from colorama import Fore, Back, Style
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Semaphore, Lock
+from threading import BoundedSemaphore, Lock
 from datetime import datetime
 from .config.loader import load_app_config, load_test_config, load_test_run_config, TestConfig
+from .connectors.base import DATACLASS_SLOTS, BaseConnector, is_placeholder_api_key
 from .connectors.registry import create_connector
 
 # Initialize colorama for cross-platform color support
 colorama.init()
 
+# Runs of whitespace collapse to a single space when comparing outputs
+_WS_RE = re.compile(r'\s+')
+
 def normalize_whitespace(text: str) -> str:
     """Normalize whitespace in text for comparison."""
-    import re
     # Replace multiple whitespace characters with single space
-    normalized = re.sub(r'\s+', ' ', text.strip())
-    return normalized
+    return _WS_RE.sub(' ', text.strip())
+
+def _load_backend(module: str, attr: str):
+    """Return module.attr from an optional dependency, or None when it isn't installed."""
+    try:
+        return getattr(import_module(module), attr)
+    except (ImportError, AttributeError):
+        return None
+
+# Optional C edit-distance backends, tried in order. StringZilla counts byte edits, so it is
+# only used for ASCII text; rapidfuzz and python-Levenshtein compare characters.
+_byte_edit_distance = _load_backend("stringzilla", "edit_distance")
+_char_edit_distance = (
+    _load_backend("rapidfuzz.distance.Levenshtein", "distance")
+    or _load_backend("Levenshtein", "distance")
+)
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculate the Levenshtein distance between two strings."""
+    if _byte_edit_distance is not None and s1.isascii() and s2.isascii():
+        return int(_byte_edit_distance(s1, s2))
+    return _char_edit_distance(s1, s2)
+
+@lru_cache(maxsize=256)
+def _match_masks(pattern: str) -> Dict[str, int]:
+    """Myers match masks for pattern: bit i is set in masks[c] when pattern[i] == c."""
+    # Cached because the same expected output is compared against every model and run
+    masks: Dict[str, int] = {}
+    bit = 1
+    for c in pattern:
+        masks[c] = masks.get(c, 0) | bit
+        bit <<= 1
+    return masks
+
+def _py_levenshtein(s1: str, s2: str) -> int:
+    """Pure-Python Levenshtein distance using the Myers/Hyyro bit-parallel algorithm."""
+    # Bit i of each vector tracks row i of a DP column over the shorter string. Python ints
+    # are unbounded, so there's no 64-character word limit and no blocking is needed.
     if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
-    
-    if len(s2) == 0:
+        s1, s2 = s2, s1
+    m = len(s2)
+    if m == 0:
         return len(s1)
     
-    previous_row = list(range(len(s2) + 1))
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+    peq = _match_masks(s2)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
     
-    return previous_row[-1]
+    vp, vn, score = mask, 0, m
+    for c in s1:
+        eq = peq.get(c, 0)
+        xv = eq | vn
+        xh = ((((eq & vp) + vp) & mask) ^ vp) | eq
+        hp = vn | (~(xh | vp) & mask)
+        hn = vp & xh
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(xv | hp) & mask)
+        vn = hp & xv
+    
+    return score
+
+if _char_edit_distance is None:
+    _char_edit_distance = _py_levenshtein
+
+def _rate_color(percent: float) -> str:
+    """Green/yellow/red console color for a pass rate or score out of 100."""
+    if percent >= 80:
+        return Fore.GREEN
+    if percent >= 50:
+        return Fore.YELLOW
+    return Fore.RED
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TestResult:
     test_name: str
     model_name: str
@@ -52,9 +116,74 @@ class TestResult:
     distance: Optional[int] = None  # Lexicographical distance for exact match tests
     latency_ms: Optional[float] = None  # First response latency in milliseconds
 
+def _count_by_model(test_results: List[TestResult]) -> Dict[str, List[int]]:
+    """Aggregate [passed, total, total_distance] per model in a single pass over the results."""
+    counts: Dict[str, List[int]] = {}
+    for r in test_results:
+        c = counts.get(r.model_name)
+        if c is None:
+            c = counts[r.model_name] = [0, 0, 0]
+        if r.passed:
+            c[0] += 1
+        c[1] += 1
+        if r.distance:
+            c[2] += r.distance
+    return counts
+
+def _group_by_model(test_results: List[TestResult]) -> Dict[str, List[TestResult]]:
+    """Bucket one test's results by model name, preserving result order."""
+    groups: Dict[str, List[TestResult]] = {}
+    for r in test_results:
+        group = groups.get(r.model_name)
+        if group is None:
+            group = groups[r.model_name] = []
+        group.append(r)
+    return groups
+
+class _RequestRateLimiter:
+    """Thread-safe sliding-window cap on how many requests may start per minute."""
+    
+    def __init__(self, requests_per_minute: int, window_s: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.window_s = window_s
+        self._starts: Deque[float] = deque()  # time.monotonic() of recent request starts
+        self._lock = Lock()
+    
+    def acquire(self) -> None:
+        """Block until another request may start without exceeding the limit."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                cutoff = now - self.window_s
+                while self._starts and self._starts[0] <= cutoff:
+                    self._starts.popleft()
+                if len(self._starts) < self.requests_per_minute:
+                    self._starts.append(now)
+                    return
+                # Sleep until the oldest start leaves the window, then re-check
+                wait_s = self._starts[0] + self.window_s - now
+            time.sleep(wait_s)
+
 class ModelTestRunner:
     """Runs model tests defined in YAML configuration files with parallel execution."""
     
+    # Minimum seconds between progress-line redraws
+    _PROGRESS_INTERVAL_S = 0.1
+    
+    # Max concurrent calls per provider; unlisted providers share the 'echo' limit
+    PROVIDER_CONCURRENCY = {
+        'openai': 10,
+        'anthropic': 5,
+        'echo': 20,  # Local echo can handle more
+        'mock': 20,  # Mock can handle more
+    }
+    
+    # Requests-per-minute caps, so bursts of fast responses don't run into 429 backoff
+    PROVIDER_REQUESTS_PER_MINUTE = {
+        'openai': 3500,
+        'anthropic': 1000,
+    }
+    
     def __init__(self, models_config_path: str = "config/models.yaml", 
                  tests_config_path: str = "config/tests-cases.yaml",
                  test_run_config_path: str = "config/test-run.yaml",
@@ -70,12 +199,25 @@ class ModelTestRunner:
         
         # Rate limiting controls for different API providers
         self.rate_limiters = {
-            'openai': Semaphore(10),  # Max 10 concurrent OpenAI calls
-            'anthropic': Semaphore(5),  # Max 5 concurrent Anthropic calls
-            'echo': Semaphore(20),  # Local echo can handle more
-            'mock': Semaphore(20),  # Mock can handle more
+            provider: BoundedSemaphore(limit) for provider, limit in self.PROVIDER_CONCURRENCY.items()
         }
         
+        self.request_rate_limits = {
+            provider: _RequestRateLimiter(rpm) for provider, rpm in self.PROVIDER_REQUESTS_PER_MINUTE.items()
+        }
+        
+        # Idle connectors per model, reused across runs so sessions and sockets stay warm.
+        # A connector is checked out by one run at a time, so stateful ones stay safe.
+        self._idle_connectors: Dict[str, List[BaseConnector]] = {}
+        self._connector_lock = Lock()
+        
+        # Normalized (exact match) or lowercased (substring) expected output per test,
+        # filled on first use since it's the same for every model and run
+        self._expected_forms: Dict[str, str] = {}
+        
+        # Last progress-line redraw (time.monotonic), used to throttle console updates
+        self._last_progress_ts = 0.0
+        
         # Failed test logging
         self.log_file_path = self._get_log_file_path()
         self.log_lock = Lock()  # Thread-safe logging
@@ -130,6 +272,9 @@ class ModelTestRunner:
             all_models = sorted(set(result.model_name for test_results in results.values() for result in test_results))
             all_tests = sorted(results.keys())
             
+            # Per-test results bucketed by model, shared by the matrix and latency tables
+            results_by_model = {test_name: _group_by_model(test_results) for test_name, test_results in results.items()}
+            
             # Calculate model statistics
             model_stats = {}
             for model in all_models:
@@ -359,7 +504,7 @@ class ModelTestRunner:
                         <td><strong>{test_name}</strong></td>"""
                 
                 for model in all_models:
-                    model_test_results = [r for r in test_results if r.model_name == model]
+                    model_test_results = results_by_model[test_name].get(model)
                     if model_test_results:
                         passed = sum(1 for r in model_test_results if r.passed)
                         total = len(model_test_results)
@@ -399,7 +544,7 @@ class ModelTestRunner:
                         <td><strong>{test_name}</strong></td>"""
                 
                 for model_name in all_models:
-                    model_test_results = [r for r in results[test_name] if r.model_name == model_name and r.latency_ms is not None]
+                    model_test_results = [r for r in results_by_model[test_name].get(model_name, ()) if r.latency_ms is not None]
                     if model_test_results:
                         latencies = [r.latency_ms for r in model_test_results]
                         latencies.sort()
@@ -446,13 +591,52 @@ class ModelTestRunner:
         except Exception as e:
             print(f"{Fore.RED}Warning: Failed to export results to HTML: {e}{Style.RESET_ALL}")
     
-    def _get_provider_semaphore(self, model_name: str) -> Semaphore:
+    def _acquire_connector(self, model_name: str) -> BaseConnector:
+        """Check out an idle connector for the model, creating one if none is free."""
+        with self._connector_lock:
+            idle = self._idle_connectors.get(model_name)
+            if idle:
+                return idle.pop()
+        connector = create_connector(model_name, self.models_config)
+        # The connector takes the RPM limiter on every attempt, so its retries count too
+        connector.request_rate_limit = self._get_request_rate_limit(model_name)
+        return connector
+    
+    def _release_connector(self, model_name: str, connector: BaseConnector) -> None:
+        """Return a connector to the idle pool for reuse by later runs."""
+        with self._connector_lock:
+            self._idle_connectors.setdefault(model_name, []).append(connector)
+    
+    def close(self) -> None:
+        """Close all pooled connectors."""
+        with self._connector_lock:
+            pooled = [c for idle in self._idle_connectors.values() for c in idle]
+            self._idle_connectors.clear()
+        for connector in pooled:
+            connector.close()
+    
+    def _get_limit_key(self, model_name: str) -> str:
+        """Key of the concurrency limit that applies to a model."""
+        model_config = self.models_config.models.get(model_name)
+        if model_config is None or model_config.provider not in self.rate_limiters:
+            return 'echo'  # Default fallback
+        return model_config.provider
+    
+    def _get_provider_semaphore(self, model_name: str) -> BoundedSemaphore:
         """Get the appropriate rate limiter for a model."""
-        if model_name not in self.models_config.models:
-            return self.rate_limiters['echo']  # Default fallback
-        
-        provider = self.models_config.models[model_name].provider
-        return self.rate_limiters.get(provider, self.rate_limiters['echo'])
+        return self.rate_limiters[self._get_limit_key(model_name)]
+    
+    def _get_pool_size(self, model_runs: List[Tuple[str, int]]) -> int:
+        """Worker threads for a run: max_workers, capped by what the provider semaphores let through."""
+        limit_keys = {self._get_limit_key(model_name) for model_name, _ in model_runs}
+        return max(1, min(self.max_workers, sum(self.PROVIDER_CONCURRENCY[key] for key in limit_keys)))
+    
+    def _get_request_rate_limit(self, model_name: str) -> Optional[_RequestRateLimiter]:
+        """Get the requests-per-minute limiter for a model's provider, if it has one."""
+        model_config = self.models_config.models.get(model_name)
+        if model_config is None:
+            return None
+        return self.request_rate_limits.get(model_config.provider)
     
     def _validate_all_model_api_keys(self) -> None:
         """Validate API keys for all models before starting execution."""
@@ -468,7 +652,7 @@ class ModelTestRunner:
                         continue  # Skip validation for local providers
                     
                     # For remote providers, just check if API key exists and is not dummy
-                    if not model_config.api_key or model_config.api_key.strip() == "" or model_config.api_key in ["dummy", "test-key", "mock-key", "${OPENAI_API_KEY}", "${ANTHROPIC_API_KEY}"]:
+                    if is_placeholder_api_key(model_config.api_key):
                         provider_name = self._get_provider_name(model_config.endpoint)
                         env_var_name = self._get_env_var_name(model_config.endpoint)
                         print(f"\n{Fore.RED}🚫 API key is missing or invalid for {provider_name} model '{model_name}'{Style.RESET_ALL}")
@@ -512,7 +696,9 @@ class ModelTestRunner:
     
     def run_single_test(self, test_name: str, model_name: str, run_number: int = 1, total_runs: int = 1) -> TestResult:
         """Run a single test against a specific model with rate limiting."""
-        if test_name not in self.tests_config.tests:
+        # One dict lookup serves both the existence check and the config fetch
+        test_config = self.tests_config.tests.get(test_name)
+        if test_config is None:
             result = TestResult(
                 test_name=test_name,
                 model_name=model_name,
@@ -528,7 +714,10 @@ class ModelTestRunner:
             self._log_failed_test(result, total_runs)
             return result
         
-        test_config = self.tests_config.tests[test_name]
+        # Bind config fields once; they're read on every path below
+        prompt = test_config.prompt
+        expected_output = test_config.expected_output
+        exact_match = test_config.exact_match
         
         # Check if model exists in models config
         if model_name not in self.models_config.models:
@@ -536,7 +725,7 @@ class ModelTestRunner:
                 test_name=test_name,
                 model_name=model_name,
                 passed=False,
-                expected=test_config.expected_output,
+                expected=expected_output,
                 actual="",
                 run_number=run_number,
                 error=f"Model '{model_name}' not found in models configuration",
@@ -554,11 +743,14 @@ class ModelTestRunner:
             start_time = time.time()
             
             try:
-                # Create connector for the model
-                connector = create_connector(model_name, self.models_config)
+                # Reuse a pooled connector for the model (created on first use)
+                connector = self._acquire_connector(model_name)
                 
                 # Generate response and measure latency
-                result = connector.generate(test_config.prompt)
+                try:
+                    result = connector.generate(prompt)
+                finally:
+                    self._release_connector(model_name, connector)
                 end_time = time.time()
                 
                 # Use first-byte latency if available, otherwise fall back to full response time
@@ -569,23 +761,28 @@ class ModelTestRunner:
                 
                 actual_output = result.text
                 
+                expected_form = self._expected_forms.get(test_name)
+                if expected_form is None:
+                    expected_form = normalize_whitespace(expected_output) if exact_match else expected_output.lower()
+                    self._expected_forms[test_name] = expected_form
+                
                 # Check if test passes
-                if test_config.exact_match:
+                if exact_match:
                     # Normalize whitespace for comparison
-                    expected_normalized = normalize_whitespace(test_config.expected_output)
+                    expected_normalized = expected_form
                     actual_normalized = normalize_whitespace(actual_output)
                     passed = expected_normalized == actual_normalized
-                    # Calculate lexicographical distance for exact match tests
-                    distance = levenshtein_distance(expected_normalized, actual_normalized)
+                    # Calculate lexicographical distance for exact match tests (zero when they match)
+                    distance = 0 if passed else levenshtein_distance(expected_normalized, actual_normalized)
                 else:
-                    passed = test_config.expected_output.lower() in actual_output.lower()
+                    passed = expected_form in actual_output.lower()
                     distance = None  # No distance calculation for substring matches
                 
                 result = TestResult(
                     test_name=test_name,
                     model_name=model_name,
                     passed=passed,
-                    expected=test_config.expected_output,
+                    expected=expected_output,
                     actual=actual_output,
                     run_number=run_number,
                     error=None,
@@ -604,7 +801,7 @@ class ModelTestRunner:
                     test_name=test_name,
                     model_name=model_name,
                     passed=False,
-                    expected=test_config.expected_output,
+                    expected=expected_output,
                     actual="",
                     run_number=run_number,
                     error=str(e),
@@ -621,7 +818,7 @@ class ModelTestRunner:
                     test_name=test_name,
                     model_name=model_name,
                     passed=False,
-                    expected=test_config.expected_output,
+                    expected=expected_output,
                     actual="",
                     run_number=run_number,
                     error=str(e),
@@ -632,6 +829,72 @@ class ModelTestRunner:
                 self._log_failed_test(result, total_runs)
                 return result
     
+    def _model_runs(self) -> List[Tuple[str, int]]:
+        """Resolve (model, runs) for every configured model."""
+        # Resolved per run rather than in __init__, since --runs overrides runs_per_test afterwards
+        runs_per_test = self.test_run_config.runs_per_test
+        # Use model-specific runs only if explicitly set in the config
+        return [
+            (model_run.name, model_run.runs if 'runs' in model_run.model_fields_set else runs_per_test)
+            for model_run in self.test_run_config.models
+        ]
+    
+    def _get_test_tasks(self, test_name: str,
+                        model_runs: Optional[List[Tuple[str, int]]] = None) -> List[Tuple[str, str, int]]:
+        """Build the (test, model, run) tasks for one test across all configured models."""
+        if model_runs is None:
+            model_runs = self._model_runs()
+        return [
+            (test_name, model_name, run_num)
+            for model_name, runs in model_runs
+            for run_num in range(1, runs + 1)
+        ]
+    
+    def _task_error_result(self, test_name: str, model_name: str, run_num: int,
+                           error: Exception, total_runs: int) -> TestResult:
+        """Build (and log) the result for a task whose execution raised."""
+        # Get expected output from test config for proper error reporting
+        expected_output = ""
+        if test_name in self.tests_config.tests:
+            expected_output = self.tests_config.tests[test_name].expected_output
+        
+        error_result = TestResult(
+            test_name=test_name,
+            model_name=model_name,
+            passed=False,
+            expected=expected_output,
+            actual="",
+            run_number=run_num,
+            error=f"Model execution failed: {str(error)}",
+            distance=None
+        )
+        # Log failed tests
+        self._log_failed_test(error_result, total_runs)
+        return error_result
+    
+    def _print_test_progress(self, test_name: str, completed_runs: int, total_runs: int) -> None:
+        """Show progress within a test on a single, overwritten line."""
+        # Redraw at most every _PROGRESS_INTERVAL_S, but always show the final count
+        now = time.monotonic()
+        if completed_runs < total_runs and now - self._last_progress_ts < self._PROGRESS_INTERVAL_S:
+            return
+        self._last_progress_ts = now
+        progress_percentage = int((completed_runs / total_runs) * 100)
+        # Clear the line and print progress (ensure we clear any previous content)
+        print(f"\r{' ' * 100}\r{Fore.CYAN}🔄 {test_name}{Style.RESET_ALL} progress: {completed_runs}/{total_runs} runs ({progress_percentage}%)", end="", flush=True)
+    
+    def _print_test_completion(self, test_name: str, results: List[TestResult],
+                               completed_tests: int, total_tests: int) -> None:
+        """Show the completion summary line for a finished test."""
+        test_runs = len(results)
+        passed = sum(1 for r in results if r.passed)
+        models_tested = len(set(r.model_name for r in results))
+        runs_per_model = test_runs // models_tested if models_tested > 0 and test_runs > 0 else 0
+        
+        # Clear the progress line and print test completion
+        print(f"\r{' ' * 80}\r{Fore.GREEN}✅{Style.RESET_ALL} {Fore.YELLOW}{test_name}{Style.RESET_ALL} completed: {passed}/{test_runs} passed ({models_tested} models × {runs_per_model} runs) ({completed_tests}/{total_tests} tests)")
+        print(f"100%")
+    
     def run_test(self, test_name: str) -> List[TestResult]:
         """Run a test against all configured models for that test with parallel model execution."""
         if test_name not in self.tests_config.tests:
@@ -643,18 +906,7 @@ class ModelTestRunner:
         self._validate_all_model_api_keys()
         
         # Create all test tasks for this test (all models × all runs)
-        test_tasks = []
-        for model_run in self.test_run_config.models:
-            model_name = model_run.name
-            # Use model-specific runs if explicitly specified, otherwise use runs_per_test
-            # Check if runs was explicitly set by looking at the model_run object's __fields_set__
-            if hasattr(model_run, '__fields_set__') and 'runs' in model_run.__fields_set__:
-                runs = model_run.runs
-            else:
-                runs = self.test_run_config.runs_per_test
-            
-            for run_num in range(1, runs + 1):
-                test_tasks.append((test_name, model_name, run_num))
+        test_tasks = self._get_test_tasks(test_name)
         
         # Calculate total runs for this test
         total_runs = len(test_tasks)
@@ -672,48 +924,16 @@ class ModelTestRunner:
             for future in as_completed(future_to_task):
                 try:
                     result = future.result()
-                    results.append(result)
-                    completed_runs += 1
-                    
-                    # Calculate and show progress within this test
-                    progress_percentage = int((completed_runs / total_runs) * 100)
-                    # Clear the line and print progress (ensure we clear any previous content)
-                    print(f"\r{' ' * 100}\r{Fore.CYAN}🔄 {test_name}{Style.RESET_ALL} progress: {completed_runs}/{total_runs} runs ({progress_percentage}%)", end="", flush=True)
-                    
                 except Exception as e:
-                    task_test_name, task_model_name, task_run_num = future_to_task[future]
-                    # Get expected output from test config for proper error reporting
-                    expected_output = ""
-                    if task_test_name in self.tests_config.tests:
-                        expected_output = self.tests_config.tests[task_test_name].expected_output
-                    
-                    # Create error result
-                    error_result = TestResult(
-                        test_name=task_test_name,
-                        model_name=task_model_name,
-                        passed=False,
-                        expected=expected_output,
-                        actual="",
-                        run_number=task_run_num,
-                        error=f"Model execution failed: {str(e)}",
-                        distance=None
-                    )
-                    # Log failed tests
-                    self._log_failed_test(error_result, total_runs)
-                    results.append(error_result)
-                    completed_runs += 1
-                    
-                    # Calculate and show progress within this test
-                    progress_percentage = int((completed_runs / total_runs) * 100)
-                    # Clear the line and print progress (ensure we clear any previous content)
-                    print(f"\r{' ' * 100}\r{Fore.CYAN}🔄 {test_name}{Style.RESET_ALL} progress: {completed_runs}/{total_runs} runs ({progress_percentage}%)", end="", flush=True)
+                    result = self._task_error_result(*future_to_task[future], e, total_runs)
+                results.append(result)
+                completed_runs += 1
+                self._print_test_progress(test_name, completed_runs, total_runs)
         
         return results
     
     def run_all_tests(self) -> Dict[str, List[TestResult]]:
         """Run all tests against their configured models with parallel execution."""
-        all_results = {}
-        
         # Validate API keys for all models before starting execution
         self._validate_all_model_api_keys()
         
@@ -723,77 +943,74 @@ class ModelTestRunner:
         # Calculate total number of test runs
         total_runs = len(test_names) * self.test_run_config.runs_per_test * len(self.test_run_config.models)
         
+        # max_workers caps the pool as in run_test; threads beyond the summed provider limits
+        # for the models in this run could only block on the semaphores
+        model_runs = self._model_runs()
+        pool_size = self._get_pool_size(model_runs)
+        
         print(f"\n{Fore.CYAN}🚀 Starting parallel test execution ..{Style.RESET_ALL}")
         print(f"   {Fore.YELLOW}Tests:{Style.RESET_ALL} {len(test_names)}")
         print(f"   {Fore.YELLOW}Total Runs:{Style.RESET_ALL} {total_runs}")
         print(f"   {Fore.YELLOW}Models:{Style.RESET_ALL} {len(self.test_run_config.models)}")
-        print(f"   {Fore.YELLOW}Max Workers:{Style.RESET_ALL} {self.max_workers}")
-        print(f"   {Fore.YELLOW}Rate Limits:{Style.RESET_ALL} OpenAI: 10, Anthropic: 5, Local: 20")
+        print(f"   {Fore.YELLOW}Max Workers:{Style.RESET_ALL} {pool_size}")
+        concurrency = ", ".join(f"{provider}: {limit}" for provider, limit in self.PROVIDER_CONCURRENCY.items())
+        rpm = ", ".join(f"{provider}: {limit}" for provider, limit in self.PROVIDER_REQUESTS_PER_MINUTE.items())
+        print(f"   {Fore.YELLOW}Concurrency Limits:{Style.RESET_ALL} {concurrency}")
+        print(f"   {Fore.YELLOW}Requests/Minute:{Style.RESET_ALL} {rpm}")
         print()
         
-        # Create a list of all test tasks to run in parallel
-        test_tasks = []
-        for test_name in test_names:
-            test_tasks.append((test_name, self.run_test))
+        # Flatten every (test, model, run) task into one pool instead of a pool per test
+        tasks_by_test = {test_name: self._get_test_tasks(test_name, model_runs) for test_name in test_names}
+        all_results: Dict[str, List[TestResult]] = {test_name: [] for test_name in test_names}
+        completed_runs = dict.fromkeys(test_names, 0)
+        completed_tests = 0
+        total_tests = len(test_names)
         
-        # Execute tests in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all test tasks
-            future_to_test = {
-                executor.submit(test_func, test_name): test_name 
-                for test_name, test_func in test_tasks
+        # Tests without any model runs are complete before anything is submitted
+        for test_name, test_tasks in tasks_by_test.items():
+            if not test_tasks:
+                completed_tests += 1
+                self._print_test_completion(test_name, [], completed_tests, total_tests)
+        
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            future_to_task = {
+                executor.submit(self.run_single_test, task[0], task[1], task[2], len(test_tasks)): task
+                for test_tasks in tasks_by_test.values()
+                for task in test_tasks
             }
             
             # Collect results as they complete
-            completed_tests = 0
-            total_tests = len(test_names)
-            
-            for future in as_completed(future_to_test):
-                test_name = future_to_test[future]
+            for future in as_completed(future_to_task):
+                task = future_to_task[future]
+                test_name = task[0]
+                test_total = len(tasks_by_test[test_name])
                 try:
-                    results = future.result()
-                    all_results[test_name] = results
-                    completed_tests += 1
-                    
-                    # Show test completion summary
-                    test_runs = len(results)
-                    passed = sum(1 for r in results if r.passed)
-                    models_tested = len(set(r.model_name for r in results))
-                    runs_per_model = test_runs // models_tested if models_tested > 0 and test_runs > 0 else 0
-                    
-                    # Clear the progress line and print test completion
-                    print(f"\r{' ' * 80}\r{Fore.GREEN}✅{Style.RESET_ALL} {Fore.YELLOW}{test_name}{Style.RESET_ALL} completed: {passed}/{test_runs} passed ({models_tested} models × {runs_per_model} runs) ({completed_tests}/{total_tests} tests)")
-                    print(f"100%")
-                    
+                    result = future.result()
                 except Exception as e:
+                    result = self._task_error_result(*task, e, test_total)
+                all_results[test_name].append(result)
+                completed_runs[test_name] += 1
+                self._print_test_progress(test_name, completed_runs[test_name], test_total)
+                
+                if completed_runs[test_name] == test_total:
                     completed_tests += 1
-                    print(f"\r{' ' * 80}\r{Fore.RED}❌{Style.RESET_ALL} {Fore.YELLOW}{test_name}{Style.RESET_ALL} failed: {str(e)}")
-                    print(f"100%")
-                    all_results[test_name] = []
+                    self._print_test_completion(test_name, all_results[test_name], completed_tests, total_tests)
         
         print(f"\n{Fore.GREEN}🎉 All tests completed!{Style.RESET_ALL}")
         return all_results
     
-    def _print_model_comparison_table(self, results: Dict[str, List[TestResult]]) -> None:
+    def _print_model_comparison_table(self, counts_by_test: Dict[str, Dict[str, List[int]]], out: TextIO) -> None:
         """Print a comparison table showing model performance with distance-based scoring."""
-        print("\n" + "=" * 80)
-        print(f"{Fore.CYAN}MODEL COMPARISON TABLE{Style.RESET_ALL}")
-        print("=" * 80)
+        print("\n" + "=" * 80, file=out)
+        print(f"{Fore.CYAN}MODEL COMPARISON TABLE{Style.RESET_ALL}", file=out)
+        print("=" * 80, file=out)
         
         # Collect all model statistics with distance-based scoring
         model_stats = {}
-        test_names = list(results.keys())
-        
-        for test_name, test_results in results.items():
-            # Group results by model
-            model_results = {}
-            for result in test_results:
-                if result.model_name not in model_results:
-                    model_results[result.model_name] = []
-                model_results[result.model_name].append(result)
-            
+        
+        for test_name, model_counts in counts_by_test.items():
             # Calculate stats for each model in this test
-            for model_name, model_test_results in model_results.items():
+            for model_name, (model_passed, model_total, total_distance) in model_counts.items():
                 if model_name not in model_stats:
                     model_stats[model_name] = {
                         'total_tests': 0,
@@ -804,11 +1021,7 @@ class ModelTestRunner:
                         'test_results': {}
                     }
                 
-                model_passed = sum(1 for r in model_test_results if r.passed)
-                model_total = len(model_test_results)
-                
                 # Calculate distance-based metrics
-                total_distance = sum(r.distance or 0 for r in model_test_results)
                 avg_distance = total_distance / model_total if model_total > 0 else 0
                 
                 # Calculate score: pass rate weighted by distance (lower distance = better score)
@@ -861,8 +1074,8 @@ class ModelTestRunner:
         )
         
         # Print table header
-        print(f"\n{Fore.YELLOW}{'Model':<15} {'Score':<8} {'Pass%':<8} {'Avg Dist':<10} {'Tests':<8}{Style.RESET_ALL}")
-        print("-" * (15 + 8 + 8 + 10 + 8))
+        print(f"\n{Fore.YELLOW}{'Model':<15} {'Score':<8} {'Pass%':<8} {'Avg Dist':<10} {'Tests':<8}{Style.RESET_ALL}", file=out)
+        print("-" * (15 + 8 + 8 + 10 + 8), file=out)
         
         # Print each model's row
         for rank, (model_name, stats) in enumerate(sorted_models, 1):
@@ -871,12 +1084,7 @@ class ModelTestRunner:
             avg_distance = stats['avg_distance']
             
             # Color coding for score
-            if score >= 80:
-                score_color = Fore.GREEN
-            elif score >= 50:
-                score_color = Fore.YELLOW
-            else:
-                score_color = Fore.RED
+            score_color = _rate_color(score)
             
             # Distance color coding
             if avg_distance <= 5:
@@ -886,42 +1094,33 @@ class ModelTestRunner:
             else:
                 distance_color = Fore.RED
             
-            print(f"  {Fore.BLUE}{model_name:<13}{Style.RESET_ALL} {score_color}{score:>6.1f}{Style.RESET_ALL} {overall_pass_rate:>6.1f}% {distance_color}{avg_distance:>8.1f}{Style.RESET_ALL} {stats['passed_tests']:>3}/{stats['total_tests']:<3}")
+            print(f"  {Fore.BLUE}{model_name:<13}{Style.RESET_ALL} {score_color}{score:>6.1f}{Style.RESET_ALL} {overall_pass_rate:>6.1f}% {distance_color}{avg_distance:>8.1f}{Style.RESET_ALL} {stats['passed_tests']:>3}/{stats['total_tests']:<3}", file=out)
         
-        print("-" * (15 + 8 + 8 + 10 + 8))
+        print("-" * (15 + 8 + 8 + 10 + 8), file=out)
     
-    def _print_test_model_matrix(self, results: Dict[str, List[TestResult]]) -> None:
+    def _print_test_model_matrix(self, counts_by_test: Dict[str, Dict[str, List[int]]], out: TextIO) -> None:
         """Print a test-model matrix showing pass/fail counts for each combination."""
-        print("\n" + "=" * 80)
-        print(f"{Fore.CYAN}TEST-MODEL MATRIX{Style.RESET_ALL}")
-        print("=" * 80)
+        print("\n" + "=" * 80, file=out)
+        print(f"{Fore.CYAN}TEST-MODEL MATRIX{Style.RESET_ALL}", file=out)
+        print("=" * 80, file=out)
         
         # Get all unique models from results
-        all_models = set()
-        for test_results in results.values():
-            for result in test_results:
-                all_models.add(result.model_name)
-        
-        all_models = sorted(list(all_models))
-        
-        # Get all test names and sort by overall pass rate (descending - higher pass rate is better)
-        test_names = list(results.keys())
+        all_models = sorted({model for model_counts in counts_by_test.values() for model in model_counts})
         
         # Calculate pass rate for each test across all models
         test_pass_rates = []
-        for test_name in test_names:
-            test_results = results[test_name]
-            total_passed = sum(1 for r in test_results if r.passed)
-            total_tests = len(test_results)
+        for test_name, model_counts in counts_by_test.items():
+            total_passed = sum(c[0] for c in model_counts.values())
+            total_tests = sum(c[1] for c in model_counts.values())
             pass_rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
             test_pass_rates.append((test_name, pass_rate))
         
-        # Sort by pass rate (descending)
+        # Sort by pass rate (descending - higher pass rate is better)
         test_pass_rates.sort(key=lambda x: x[1], reverse=True)
         test_names = [name for name, _ in test_pass_rates]
         
         if not test_names or not all_models:
-            print("No test results to display")
+            print("No test results to display", file=out)
             return
         
         # Calculate column widths
@@ -929,137 +1128,145 @@ class ModelTestRunner:
         model_width = 12
         
         # Print header
-        print(f"{'Test':<{test_name_width}}", end="")
+        print(f"{'Test':<{test_name_width}}", end="", file=out)
         for model in all_models:
-            print(f"{model:^{model_width}}", end="")
-        print()
+            print(f"{model:^{model_width}}", end="", file=out)
+        print(file=out)
         
         # Print separator line
-        print("-" * test_name_width + "".join("-" * model_width for _ in all_models))
+        print("-" * test_name_width + "".join("-" * model_width for _ in all_models), file=out)
         
         # Print each test row
         for test_name in test_names:
-            test_results = results[test_name]
-            print(f"{test_name:<{test_name_width}}", end="")
+            model_counts = counts_by_test[test_name]
+            print(f"{test_name:<{test_name_width}}", end="", file=out)
             
             for model in all_models:
-                # Count passes and total for this test-model combination
-                model_test_results = [r for r in test_results if r.model_name == model]
-                if not model_test_results:
-                    print(f"{'N/A':^{model_width}}", end="")
+                counts = model_counts.get(model)
+                if counts is None:
+                    print(f"{'N/A':^{model_width}}", end="", file=out)
                 else:
-                    passed = sum(1 for r in model_test_results if r.passed)
-                    total = len(model_test_results)
+                    passed, total, _ = counts
                     pass_rate = (passed / total * 100) if total > 0 else 0
                     
                     # Color code based on pass rate
-                    if pass_rate >= 80:
-                        color = Fore.GREEN
-                    elif pass_rate >= 50:
-                        color = Fore.YELLOW
-                    else:
-                        color = Fore.RED
+                    color = _rate_color(pass_rate)
                     
                     result_text = f"{passed}/{total} ({pass_rate:.0f}%)"
-                    print(f"{color}{result_text:^{model_width}}{Style.RESET_ALL}", end="")
+                    print(f"{color}{result_text:^{model_width}}{Style.RESET_ALL}", end="", file=out)
             
-            print()
+            print(file=out)
         
-        print("-" * test_name_width + "".join("-" * model_width for _ in all_models))
+        print("-" * test_name_width + "".join("-" * model_width for _ in all_models), file=out)
     
     def print_results(self, results: Dict[str, List[TestResult]]) -> None:
         """Print test results with model comparison table and distance-based scoring."""
-        print("=" * 80)
-        print(f"{Fore.CYAN}MODEL TEST RESULTS{Style.RESET_ALL}")
-        print("=" * 80)
+        # Render every report section into memory and hand the terminal one write
+        buf = io.StringIO()
+        self._print_report(results, buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        
+        # Export results to HTML
+        self._export_results_to_html(results)
+    
+    def _print_report(self, results: Dict[str, List[TestResult]], out: TextIO) -> None:
+        """Print the summary, failure details and per-model tables."""
+        print("=" * 80, file=out)
+        print(f"{Fore.CYAN}MODEL TEST RESULTS{Style.RESET_ALL}", file=out)
+        print("=" * 80, file=out)
         
-        # Calculate total tests for summary
-        total_tests = sum(len(test_results) for test_results in results.values())
-        passed_tests = sum(1 for test_results in results.values() for result in test_results if result.passed)
+        # Count everything the summary needs and collect failures in one pass
+        total_tests = passed_tests = exact_match_tests = error_tests = 0
+        failed_tests = []
+        for result in chain.from_iterable(results.values()):
+            total_tests += 1
+            if result.passed:
+                passed_tests += 1
+            else:
+                failed_tests.append(result)
+            if result.distance is not None:
+                exact_match_tests += 1
+            if result.error is not None:
+                error_tests += 1
         
         # Show detailed test execution summary
-        print(f"\n{Fore.YELLOW}📊 Test Execution Summary:{Style.RESET_ALL}")
-        print(f"  {Fore.CYAN}Total Tests:{Style.RESET_ALL} {total_tests}")
-        print(f"  {Fore.GREEN}Tests Passed:{Style.RESET_ALL} {passed_tests}")
-        print(f"  {Fore.RED}Tests Failed:{Style.RESET_ALL} {total_tests - passed_tests}")
+        print(f"\n{Fore.YELLOW}📊 Test Execution Summary:{Style.RESET_ALL}", file=out)
+        print(f"  {Fore.CYAN}Total Tests:{Style.RESET_ALL} {total_tests}", file=out)
+        print(f"  {Fore.GREEN}Tests Passed:{Style.RESET_ALL} {passed_tests}", file=out)
+        print(f"  {Fore.RED}Tests Failed:{Style.RESET_ALL} {total_tests - passed_tests}", file=out)
         
         # Calculate additional statistics
-        failed_tests = total_tests - passed_tests
         if total_tests > 0:
             pass_rate = (passed_tests / total_tests * 100)
-            print(f"  {Fore.CYAN}Success Rate:{Style.RESET_ALL} {pass_rate:.1f}%")
+            print(f"  {Fore.CYAN}Success Rate:{Style.RESET_ALL} {pass_rate:.1f}%", file=out)
             
             # Show test distribution by type
-            exact_match_tests = sum(1 for test_results in results.values() 
-                                  for result in test_results 
-                                  if result.distance is not None)
             substring_tests = total_tests - exact_match_tests
             
-            print(f"  {Fore.CYAN}Test Types:{Style.RESET_ALL} {exact_match_tests} exact match, {substring_tests} substring")
+            print(f"  {Fore.CYAN}Test Types:{Style.RESET_ALL} {exact_match_tests} exact match, {substring_tests} substring", file=out)
             
             # Show error statistics
-            error_tests = sum(1 for test_results in results.values() 
-                            for result in test_results 
-                            if result.error is not None)
             if error_tests > 0:
-                print(f"  {Fore.RED}Errors:{Style.RESET_ALL} {error_tests} tests had errors")
+                print(f"  {Fore.RED}Errors:{Style.RESET_ALL} {error_tests} tests had errors", file=out)
         
         # Show failed test details
-        failed_tests = [result for test_results in results.values() for result in test_results if not result.passed]
         if failed_tests:
-            print(f"\n{Fore.RED}❌ Failed Test Details:{Style.RESET_ALL}")
-            print("-" * 80)
+            print(f"\n{Fore.RED}❌ Failed Test Details:{Style.RESET_ALL}", file=out)
+            print("-" * 80, file=out)
             
             for result in failed_tests:
                 test_config = self.tests_config.tests.get(result.test_name)
                 if test_config and test_config.exact_match and result.distance is not None:
-                    print(f"{Fore.RED}Test:{Style.RESET_ALL} {result.test_name} | {Fore.RED}Model:{Style.RESET_ALL} {result.model_name} | {Fore.RED}Run:{Style.RESET_ALL} {result.run_number}")
-                    print(f"  {Fore.YELLOW}Distance:{Style.RESET_ALL} {result.distance}")
-                    print(f"  {Fore.GREEN}Expected:{Style.RESET_ALL} {result.expected}")
-                    print(f"  {Fore.RED}Received:{Style.RESET_ALL} {result.actual}")
+                    print(f"{Fore.RED}Test:{Style.RESET_ALL} {result.test_name} | {Fore.RED}Model:{Style.RESET_ALL} {result.model_name} | {Fore.RED}Run:{Style.RESET_ALL} {result.run_number}", file=out)
+                    print(f"  {Fore.YELLOW}Distance:{Style.RESET_ALL} {result.distance}", file=out)
+                    print(f"  {Fore.GREEN}Expected:{Style.RESET_ALL} {result.expected}", file=out)
+                    print(f"  {Fore.RED}Received:{Style.RESET_ALL} {result.actual}", file=out)
                     if result.error:
-                        print(f"  {Fore.RED}Error:{Style.RESET_ALL} {result.error}")
-                    print()
+                        print(f"  {Fore.RED}Error:{Style.RESET_ALL} {result.error}", file=out)
+                    print(file=out)
                 else:
-                    print(f"{Fore.RED}Test:{Style.RESET_ALL} {result.test_name} | {Fore.RED}Model:{Style.RESET_ALL} {result.model_name} | {Fore.RED}Run:{Style.RESET_ALL} {result.run_number}")
-                    print(f"  {Fore.GREEN}Expected:{Style.RESET_ALL} {result.expected}")
-                    print(f"  {Fore.RED}Received:{Style.RESET_ALL} {result.actual}")
+                    print(f"{Fore.RED}Test:{Style.RESET_ALL} {result.test_name} | {Fore.RED}Model:{Style.RESET_ALL} {result.model_name} | {Fore.RED}Run:{Style.RESET_ALL} {result.run_number}", file=out)
+                    print(f"  {Fore.GREEN}Expected:{Style.RESET_ALL} {result.expected}", file=out)
+                    print(f"  {Fore.RED}Received:{Style.RESET_ALL} {result.actual}", file=out)
                     if result.error:
-                        print(f"  {Fore.RED}Error:{Style.RESET_ALL} {result.error}")
-                    print()
+                        print(f"  {Fore.RED}Error:{Style.RESET_ALL} {result.error}", file=out)
+                    print(file=out)
+        
+        # Per-test, per-model [passed, total, total_distance], shared by the two summary tables
+        counts_by_test = {test_name: _count_by_model(test_results) for test_name, test_results in results.items()}
         
         # Test-Model matrix table
-        self._print_test_model_matrix(results)
+        self._print_test_model_matrix(counts_by_test, out)
         
         # Model comparison table with distance-based scoring
-        self._print_model_comparison_table(results)
+        self._print_model_comparison_table(counts_by_test, out)
         
         # Test-Model latency table with P95 calculations
-        self._print_test_model_latency_table(results)
-        
-        # Export results to HTML
-        self._export_results_to_html(results)
+        self._print_test_model_latency_table(results, out)
     
-    def _print_test_model_latency_table(self, results: Dict[str, List[TestResult]]) -> None:
+    def _print_test_model_latency_table(self, results: Dict[str, List[TestResult]], out: TextIO) -> None:
         """Print TEST-MODEL-LATENCY table with P95 latency calculations."""
-        print("\n" + "=" * 80)
-        print(f"{Fore.CYAN}TEST-MODEL-LATENCY TABLE{Style.RESET_ALL}")
-        print("=" * 80)
+        print("\n" + "=" * 80, file=out)
+        print(f"{Fore.CYAN}TEST-MODEL-LATENCY TABLE{Style.RESET_ALL}", file=out)
+        print("=" * 80, file=out)
         
         # Get all unique models and tests
         all_models = sorted(set(result.model_name for test_results in results.values() for result in test_results))
         all_tests = sorted(results.keys())
         
         if not all_models or not all_tests:
-            print("No latency data available.")
+            print("No latency data available.", file=out)
             return
         
         # Calculate latency statistics for each test-model combination
         latency_data = {}
         for test_name in all_tests:
             latency_data[test_name] = {}
+            # Bucket this test's results by model once instead of rescanning them per model
+            by_model = _group_by_model(results[test_name])
             for model_name in all_models:
-                model_test_results = [r for r in results[test_name] if r.model_name == model_name and r.latency_ms is not None]
+                model_test_results = [r for r in by_model.get(model_name, ()) if r.latency_ms is not None]
                 if model_test_results:
                     latencies = [r.latency_ms for r in model_test_results]
                     latencies.sort()
@@ -1099,8 +1306,8 @@ class ModelTestRunner:
         header = f"{'Test':<{test_col_width}}"
         for model in all_models:
             header += f"{model:<{model_col_width}}"
-        print(header)
-        print("-" * (test_col_width + model_col_width * len(all_models)))
+        print(header, file=out)
+        print("-" * (test_col_width + model_col_width * len(all_models)), file=out)
         
         # Print latency data for each test
         for test_name in all_tests:
@@ -1122,13 +1329,13 @@ class ModelTestRunner:
                     row += f"{latency_str:<{model_col_width}}"
                 else:
                     row += f"{'N/A':<{model_col_width}}"
-            print(row)
+            print(row, file=out)
         
         # Print summary statistics
-        print("-" * (test_col_width + model_col_width * len(all_models)))
-        print(f"{Fore.YELLOW}Latency Legend:{Style.RESET_ALL}")
-        print(f"  {Fore.GREEN}Green: < 1000ms{Style.RESET_ALL}")
-        print(f"  {Fore.YELLOW}Yellow: 1000-2000ms{Style.RESET_ALL}")
-        print(f"  {Fore.RED}Red: > 2000ms{Style.RESET_ALL}")
-        print(f"  Values shown are P95 (95th percentile) latencies")
+        print("-" * (test_col_width + model_col_width * len(all_models)), file=out)
+        print(f"{Fore.YELLOW}Latency Legend:{Style.RESET_ALL}", file=out)
+        print(f"  {Fore.GREEN}Green: < 1000ms{Style.RESET_ALL}", file=out)
+        print(f"  {Fore.YELLOW}Yellow: 1000-2000ms{Style.RESET_ALL}", file=out)
+        print(f"  {Fore.RED}Red: > 2000ms{Style.RESET_ALL}", file=out)
+        print(f"  Values shown are P95 (95th percentile) latencies", file=out)
         
@@ -0,0 +1,14 @@
+import importlib.util
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location("run_tests", Path(__file__).parent.parent / "run_tests.py")
+run_tests = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run_tests)
+
+
+def test_static_help_matches_parser(monkeypatch):
+    # argparse wraps help to the terminal width; the static copy was rendered at 80 columns
+    monkeypatch.setenv("COLUMNS", "80")
+    parser = run_tests.build_parser()
+    parser.prog = "run_tests.py"
+    assert parser.format_help().rstrip("\n") == run_tests._STATIC_HELP
@@ -1,5 +1,61 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock
+
+import pytest
+import requests
+
 from ai_testbed.config.loader import load_app_config
+from ai_testbed.connectors import openai_realtime_websocket as rtws
+from ai_testbed.connectors import registry
+from ai_testbed.connectors._http import ERROR_BODY_LIMIT, describe_request_error
+from ai_testbed.connectors.anthropic import AnthropicConnector
+from ai_testbed.connectors.base import GenerateResult, is_placeholder_api_key, parse_retry_after
+from ai_testbed.connectors.echo import EchoConnector
+from ai_testbed.connectors.mock import MockConnector
+from ai_testbed.connectors.openai import OpenAIConnector
 from ai_testbed.connectors.registry import create_connector
+from ai_testbed.connectors.reverse_echo import ReverseEchoConnector
+
+
+class FakeWebSocketApp:
+    """In-process stand-in for websocket.WebSocketApp that upper-cases each prompt."""
+
+    def __init__(self, url, header, on_message, on_error, on_close, on_open):
+        self.on_message = on_message
+        self.stopped = threading.Event()
+        self.stale = False  # Set to make the next send fail like a dropped idle socket
+
+    def run_forever(self, **kwargs):
+        self.on_message(self, '{"type": "session.created", "session": {"id": "sess_1"}}')
+        self.stopped.wait()
+
+    def send(self, data):
+        if self.stale:
+            raise rtws.websocket.WebSocketConnectionClosedException("closed")
+        text = json.loads(data)["response"]["input"][0]["content"][0]["text"]
+        self.on_message(self, json.dumps({"type": "response.output_text.delta", "delta": text.upper()}))
+        self.on_message(self, '{"type": "response.done"}')
+
+    def close(self):
+        self.stopped.set()
+
+
+@pytest.fixture
+def fake_ws_apps(monkeypatch):
+    """Patch in FakeWebSocketApp and return the list of apps opened so far."""
+    opened = []
+
+    def factory(*args, **kwargs):
+        app = FakeWebSocketApp(*args, **kwargs)
+        opened.append(app)
+        return app
+
+    monkeypatch.setattr(rtws.websocket, "WebSocketApp", factory)
+    return opened
+
 
 def test_mock_connector_roundtrip():
     cfg = load_app_config("config/models.yaml")
@@ -7,3 +63,166 @@ def test_mock_connector_roundtrip():
     out = conn.generate("abcd")
     assert out.text == "abcd"  # Mock connector now returns first 10 characters
     assert out.model == "mock-gpt"
+
+def test_generate_many_preserves_prompt_order():
+    cfg = load_app_config("config/models.yaml")
+    conn = create_connector("echo-local", cfg)
+    prompts = [f"prompt {i}" for i in range(10)]
+    results = conn.generate_many(prompts, concurrency=4)
+    assert [r.text for r in results] == prompts
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("not a date") is None
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    delay = parse_retry_after(format_datetime(when, usegmt=True))
+    assert 100 < delay <= 120
+
+def test_remote_connector_rejects_placeholder_api_key():
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        OpenAIConnector("gpt-4", "https://api.openai.com/v1/chat/completions", "dummy")
+    with pytest.raises(ValueError):
+        OpenAIConnector("gpt-4", "https://api.openai.com/v1/chat/completions", "   ")
+
+def test_anthropic_request_body_is_valid_json():
+    conn = AnthropicConnector("claude-test", "https://api.anthropic.com/v1/messages", "sk-real", max_retries=0)
+    response = Mock(status_code=200, content=b'{"content": [{"type": "text", "text": "hi"}]}')
+    conn._session.post = Mock(return_value=response)
+
+    out = conn.generate('say "hi" é')
+    assert out.text == "hi"
+    body = json.loads(conn._session.post.call_args.kwargs["data"])
+    assert body == {
+        "model": "claude-test",
+        "max_tokens": 1024,
+        "messages": [{"role": "user", "content": 'say "hi" é'}],
+    }
+
+def test_openai_responses_endpoint_parses_raw_bytes():
+    conn = OpenAIConnector("gpt-test", "https://api.openai.com/v1/responses", "sk-real", max_retries=0)
+    raw = b'{"output": [{"type": "message", "content": [{"type": "output_text", "text": "hi"}]}]}'
+    conn._session.post = Mock(return_value=Mock(status_code=200, content=raw))
+
+    out = conn.generate("say hi")
+    assert out.text == "hi"
+    assert json.loads(conn._session.post.call_args.kwargs["data"]) == {"model": "gpt-test", "input": "say hi"}
+
+def test_openai_chat_endpoint_uses_chat_payload():
+    conn = OpenAIConnector("gpt-test", "https://api.openai.com/v1/chat/completions", "sk-real", max_retries=0)
+    raw = b'{"choices": [{"message": {"content": "hi"}}]}'
+    conn._session.post = Mock(return_value=Mock(status_code=200, content=raw))
+
+    assert conn.generate("say hi").text == "hi"
+    body = json.loads(conn._session.post.call_args.kwargs["data"])
+    assert body["messages"] == [{"role": "user", "content": "say hi"}]
+    assert "input" not in body
+
+def test_openai_error_reports_status_and_bounded_body():
+    conn = OpenAIConnector("gpt-test", "https://api.openai.com/v1/chat/completions", "sk-real", max_retries=0)
+    response = Mock(status_code=429, content=b"x" * 10_000, headers={"Retry-After": "7"})
+    conn._session.post = Mock(return_value=response)
+
+    out = conn._generate_single("hi")
+    assert out.status_code == 429 and out.retry_after_s == 7.0
+    assert "x" * ERROR_BODY_LIMIT in out.error and "x" * (ERROR_BODY_LIMIT + 1) not in out.error
+
+def test_generate_without_retries_calls_backend_once():
+    conn = EchoConnector("echo-local", "mock://echo", "", max_retries=0)
+    conn._generate_single = Mock(side_effect=RuntimeError("boom"))
+    out = conn.generate("hi")
+    assert conn._generate_single.call_count == 1
+    assert "boom" in out.error
+
+
+def test_remote_connector_skips_request_for_empty_prompt():
+    conn = AnthropicConnector("claude-test", "https://api.anthropic.com/v1/messages", "sk-real")
+    conn._session.post = Mock()
+    out = conn.generate("")
+    assert out.error == "Empty prompt"
+    conn._session.post.assert_not_called()
+
+
+def test_response_cache_is_opt_in_and_reuses_results():
+    conn = MockConnector("mock-cache-test", "mock://cache", "")
+    conn._generate_single = Mock(return_value=GenerateResult(text="out", model="mock-cache-test"))
+    conn.generate("same")
+    conn.generate("same")
+    assert conn._generate_single.call_count == 2
+
+    conn.cache_responses = True
+    first = conn.generate("cached")
+    first.text = "mutated"
+    second = conn.generate("cached")
+    assert second.text == "out"
+    assert conn._generate_single.call_count == 3
+
+
+def test_realtime_ws_handlers_signal_waiters():
+    conn = rtws.OpenAIRealtimeWebSocketConnector(api_key="sk-real")
+    conn._on_message(None, '{"type": "session.created", "session": {"id": "sess_1"}}')
+    assert conn._session_ready.is_set() and conn.session_id == "sess_1"
+    assert not conn._done.is_set()
+
+    # Frames arrive as raw bytes because the client skips its own UTF-8 decode
+    conn._on_message(None, b'{"type": "response.output_text.delta", "delta": "hi"}')
+    conn._on_message(None, '{"type": "response.done"}')
+    assert conn._done.wait(0) and conn.response_text == "hi"
+
+    # Frames trailing a finished response are ignored without parsing
+    conn._on_message(None, b'{"type": "error", "error": {"message": "late"}}')
+    conn._on_message(None, b"not json")
+    assert conn.response_error is None and conn._response_parts == ["hi"]
+
+
+def test_realtime_ws_reuses_session_across_prompts(fake_ws_apps):
+    conn = rtws.OpenAIRealtimeWebSocketConnector(api_key="sk-real", max_retries=0)
+    assert conn.generate("one").text == "ONE"
+    assert conn.generate("two").text == "TWO"
+    assert len(fake_ws_apps) == 1
+    conn.close()
+    assert fake_ws_apps[0].stopped.is_set()
+
+
+def test_describe_request_error_keeps_category_messages():
+    assert describe_request_error(requests.exceptions.ReadTimeout()) == "Request timeout"
+    assert describe_request_error(requests.exceptions.ConnectionError("down")) == "Request error: down"
+    assert describe_request_error(KeyError("choices")).startswith("Response parsing error:")
+    assert describe_request_error(json.JSONDecodeError("bad", "", 0)).startswith("Response parsing error:")
+    assert describe_request_error(RuntimeError("boom")) == "Unexpected error: boom"
+
+
+def test_realtime_ws_reconnects_when_idle_socket_is_stale(fake_ws_apps):
+    conn = rtws.OpenAIRealtimeWebSocketConnector(api_key="sk-real", max_retries=0)
+    assert conn.generate("one").text == "ONE"
+    fake_ws_apps[0].stale = True
+    out = conn.generate("two")
+    assert out.error is None and out.text == "TWO"
+    assert len(fake_ws_apps) == 2 and fake_ws_apps[0].stopped.is_set()
+    conn.close()
+
+
+def test_registry_resolves_providers_lazily():
+    assert registry.get_connector_class("reverse-echo") is ReverseEchoConnector
+    assert registry._resolved["reverse-echo"] is ReverseEchoConnector
+    with pytest.raises(ValueError, match="No connector registered"):
+        registry.get_connector_class("nope")
+
+
+def test_is_placeholder_api_key():
+    for key in (None, "", "   ", "dummy", "${OPENAI_API_KEY}"):
+        assert is_placeholder_api_key(key)
+    assert not is_placeholder_api_key("sk-real")
+
+
+def test_request_rate_limit_taken_on_every_attempt(monkeypatch):
+    conn = MockConnector("mock-gpt", "mock://local", "", max_retries=2, retry_delay=0)
+    monkeypatch.setattr(conn, "_wait_before_retry", lambda attempt, delay: None)
+    results = iter([GenerateResult(text="", model="m", error="boom"), GenerateResult(text="ok", model="m")])
+    monkeypatch.setattr(conn, "_generate_single", lambda prompt: next(results))
+    conn.request_rate_limit = Mock()
+
+    assert conn.generate_with_retry("hi").text == "ok"
+    assert conn.request_rate_limit.acquire.call_count == 2
@@ -0,0 +1,79 @@
+import os
+from ai_testbed.config import loader
+from ai_testbed.config.loader import load_app_config
+
+
+def _write_models(path, timeout_s):
+    path.write_text(
+        "models:\n"
+        "  mock-gpt:\n"
+        "    provider: mock\n"
+        "    endpoint: mock://local\n"
+        "    api_key: dummy\n"
+        f"    timeout_s: {timeout_s}\n",
+        encoding="utf-8",
+    )
+
+
+def test_yaml_cache_reuses_unchanged_file(tmp_path):
+    cfg_path = tmp_path / "models.yaml"
+    _write_models(cfg_path, 10)
+
+    first = loader._load_yaml(str(cfg_path))
+    assert str(cfg_path.resolve()) in loader._YAML_CACHE
+
+    # Mutating the returned data must not leak into the cache
+    first["models"]["mock-gpt"]["timeout_s"] = 99
+    second = load_app_config(str(cfg_path))
+    assert second.models["mock-gpt"].timeout_s == 10
+
+
+def test_yaml_cache_invalidated_when_file_changes(tmp_path):
+    cfg_path = tmp_path / "models.yaml"
+    _write_models(cfg_path, 10)
+    assert load_app_config(str(cfg_path)).models["mock-gpt"].timeout_s == 10
+
+    _write_models(cfg_path, 120)
+    # Force a different mtime even on filesystems with coarse timestamps
+    st = os.stat(cfg_path)
+    os.utime(cfg_path, (st.st_atime, st.st_mtime + 5))
+    assert load_app_config(str(cfg_path)).models["mock-gpt"].timeout_s == 120
+
+
+def test_env_expand_substitutes_vars_and_defaults(monkeypatch):
+    monkeypatch.setenv("TESTBED_KEY", "secret")
+    monkeypatch.delenv("TESTBED_MISSING", raising=False)
+
+    assert loader._env_expand("plain value") == "plain value"
+    assert loader._env_expand("${TESTBED_KEY}") == "secret"
+    assert loader._env_expand("a-${TESTBED_KEY}-b") == "a-secret-b"
+    assert loader._env_expand("${TESTBED_MISSING:-dummy}") == "dummy"
+    assert loader._env_expand("${TESTBED_MISSING:-}") == ""
+    # Unset variables without a default are left untouched
+    assert loader._env_expand("${TESTBED_MISSING}") == "${TESTBED_MISSING}"
+    # Lowercase names are not treated as interpolation
+    assert loader._env_expand("${lower}") == "${lower}"
+
+
+def test_expand_env_returns_untouched_subtrees_unchanged(monkeypatch):
+    monkeypatch.setenv("TESTBED_KEY", "secret")
+    static = {"provider": "mock", "timeout_s": 5, "tags": ["a", "b"]}
+    data = {"static": static, "dynamic": {"api_key": "${TESTBED_KEY}"}}
+
+    expanded = loader._expand_env(data)
+    assert expanded["dynamic"]["api_key"] == "secret"
+    assert expanded["static"] is static
+    # The input document is never mutated
+    assert data["dynamic"]["api_key"] == "${TESTBED_KEY}"
+
+
+def test_env_expand_handles_malformed_and_nested_references(monkeypatch):
+    monkeypatch.setenv("TESTBED_KEY", "secret")
+
+    assert loader._env_expand("${TESTBED_KEY") == "${TESTBED_KEY"
+    assert loader._env_expand("${a${TESTBED_KEY}") == "${asecret"
+    assert loader._env_expand("${${TESTBED_KEY}}") == "${secret}"
+    assert loader._env_expand("${TESTBED_KEY:-x:-y}") == "secret"
+    assert loader._env_expand("${TESTBED_NOPE:-x:-y}") == "x:-y"
+    assert loader._env_expand("${A-B}") == "${A-B}"
+    assert loader._env_expand("$${TESTBED_KEY}$") == "$secret$"
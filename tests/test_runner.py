@@ -711,4 +711,89 @@ def test_print_results_color_coding(mock_load_app, mock_load_test, mock_load_tes
     assert "\x1b[" in captured.out  # ANSI color codes
     assert "MODEL TEST RESULTS" in captured.out
     assert "FINAL SUMMARY" in captured.out
-    assert "Overall Pass Rate:" in captured.out
\ No newline at end of file
+    assert "Overall Pass Rate:" in captured.out
+
+@patch('ai_testbed.test_runner.load_app_config')
+@patch('ai_testbed.test_runner.load_test_run_config')
+def test_run_single_test_reuses_pooled_connector(mock_load_test_run, mock_load_app):
+    """Test that sequential runs check the same connector back out of the pool."""
+    mock_load_app.return_value = AppConfig(
+        models={"mock-gpt": ModelConfig(provider="mock", endpoint="mock://local", api_key="dummy")}
+    )
+    mock_load_test_run.return_value = (
+        TestRunConfig(models=[ModelRunConfig(name="mock-gpt")]),
+        TestSuiteConfig(tests={
+            "test1": TestConfig(name="Test 1", description="d", prompt="abc", expected_output="abc")
+        }),
+    )
+    runner = ModelTestRunner("dummy", "", "dummy")
+
+    with patch('ai_testbed.test_runner.create_connector') as mock_create:
+        mock_create.return_value.generate.return_value = Mock(text="abc", first_byte_latency_ms=1.0)
+        for run in (1, 2, 3):
+            assert runner.run_single_test("test1", "mock-gpt", run_number=run).passed
+        assert mock_create.call_count == 1
+
+        runner.close()
+        mock_create.return_value.close.assert_called_once()
+
+
+@patch('ai_testbed.test_runner.load_app_config')
+@patch('ai_testbed.test_runner.load_test_run_config')
+def test_pool_size_matches_provider_limits(mock_load_test_run, mock_load_app):
+    """Test that the worker pool is sized to the provider limits of the models in the run."""
+    mock_load_app.return_value = AppConfig(models={
+        "gpt": ModelConfig(provider="openai", endpoint="https://api.openai.com/v1/chat/completions", api_key="sk-x"),
+        "gpt-2": ModelConfig(provider="openai", endpoint="https://api.openai.com/v1/chat/completions", api_key="sk-x"),
+        "half": ModelConfig(provider="half-echo", endpoint="mock://half-echo", api_key=""),
+    })
+    mock_load_test_run.return_value = (TestRunConfig(models=[ModelRunConfig(name="gpt")]), TestSuiteConfig(tests={}))
+    runner = ModelTestRunner("dummy", "", "dummy", max_workers=50)
+
+    # Two OpenAI models share one semaphore; unknown providers fall back to the echo limit
+    assert runner._get_pool_size([("gpt", 1), ("gpt-2", 1)]) == 10
+    assert runner._get_pool_size([("gpt", 1), ("half", 1)]) == 30
+    assert runner._get_pool_size([]) == 1
+
+    # max_workers is honoured as an upper bound, as in run_test
+    runner.max_workers = 4
+    assert runner._get_pool_size([("gpt", 1), ("half", 1)]) == 4
+
+
+def test_levenshtein_distance_falls_back_for_non_ascii(monkeypatch):
+    """Byte-level backends are skipped for non-ASCII text"""
+    from ai_testbed import test_runner
+
+    calls = []
+    monkeypatch.setattr(test_runner, "_byte_edit_distance", lambda a, b: calls.append((a, b)) or 99)
+    monkeypatch.setattr(test_runner, "_char_edit_distance", test_runner._py_levenshtein)
+
+    assert test_runner.levenshtein_distance("héllo", "hello") == 1
+    assert calls == []
+    assert test_runner.levenshtein_distance("kitten", "sitting") == 99
+    assert calls == [("kitten", "sitting")]
+
+
+def test_py_levenshtein_handles_long_and_unicode_strings():
+    """The bit-parallel fallback is not limited to one machine word"""
+    from ai_testbed.test_runner import _py_levenshtein
+
+    assert _py_levenshtein("a" * 100, "a" * 90 + "b" * 10) == 10
+    assert _py_levenshtein("x" * 70 + "kitten", "x" * 70 + "sitting") == 3
+    assert _py_levenshtein("naïve café", "naive cafe") == 2
+    assert _py_levenshtein("", "a" * 80) == 80
+
+
+def test_request_rate_limiter_waits_for_window():
+    """Requests beyond the per-window cap wait until the oldest one ages out"""
+    import time
+    from ai_testbed.test_runner import _RequestRateLimiter
+
+    limiter = _RequestRateLimiter(2, window_s=0.2)
+    start = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    assert time.monotonic() - start < 0.1
+
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.2